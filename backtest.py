@@ -0,0 +1,244 @@
+"""
+Strategy backtesting for CryptoWise.
+
+Replays historical prices from a CSV or Parquet file through vectorized
+signal functions and sweeps strategy parameters across a process pool.
+The price matrix is written once to a .npy file and memory-mapped by every
+worker, so it is never copied per configuration. The trades of the best
+configuration can be recorded in a trade ledger, where the app's history,
+portfolio and exports pick them up like any other trades.
+
+Usage:
+    python backtest.py prices.csv --strategy sma_crossover --grid fast=5,10,20 slow=50,100 --workers 8
+    python backtest.py prices.csv --strategy momentum --grid lookback=5,20 --ledger trading_history.ledger
+"""
+import argparse
+import itertools
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from cryptowise.ledger import TRADE_DTYPE, TradeLedger, local_utc_offsets
+
+
+def load_prices(path):
+    """
+    Loads prices either in wide format (a timestamp column and one column per
+    coin) or long format (timestamp, coin, price columns).
+    Returns the timestamps, the coin names and a (time x coin) price matrix.
+    """
+    if path.endswith(".parquet"):
+        df = pd.read_parquet(path)
+    else:
+        df = pd.read_csv(path)
+    df["timestamp"] = pd.to_datetime(df["timestamp"])
+    if {"coin", "price"} <= set(df.columns):
+        df = df.pivot_table(index="timestamp", columns="coin", values="price")
+    else:
+        df = df.set_index("timestamp")
+    df = df.sort_index().ffill().dropna()
+    return df.index.to_numpy(), list(df.columns), df.to_numpy(dtype=np.float64)
+
+
+# --------------------------
+# Strategies
+# --------------------------
+
+def _check_window(**windows):
+    for name, window in windows.items():
+        if window < 1:
+            raise ValueError(f"{name} must be at least 1, got {window}")
+
+
+def _rolling_mean(prices, window):
+    sums = np.cumsum(prices, axis=0)
+    mean = np.full_like(prices, np.nan)
+    mean[window - 1] = sums[window - 1] / window
+    mean[window:] = (sums[window:] - sums[:-window]) / window
+    return mean
+
+
+def sma_crossover(prices, fast=10, slow=50):
+    """
+    Long while the fast moving average is above the slow one.
+    """
+    _check_window(fast=fast, slow=slow)
+    if fast >= slow or slow > len(prices):
+        return np.zeros_like(prices)
+    return (_rolling_mean(prices, fast) > _rolling_mean(prices, slow)).astype(np.float64)
+
+
+def momentum(prices, lookback=20):
+    """
+    Long while the price is above its level `lookback` periods ago.
+    """
+    _check_window(lookback=lookback)
+    signal = np.zeros_like(prices)
+    signal[lookback:] = prices[lookback:] > prices[:-lookback]
+    return signal
+
+
+STRATEGIES = {
+    "sma_crossover": sma_crossover,
+    "momentum": momentum,
+}
+
+
+# --------------------------
+# Replay
+# --------------------------
+
+def run_backtest(prices, signal, fee=0.001, periods_per_year=365):
+    """
+    Trades every coin to its target position, one period after the signal.
+    Returns total return, annualized Sharpe ratio, maximum drawdown and
+    number of trades per coin.
+    """
+    position = signal[:-1]
+    returns = prices[1:] / prices[:-1] - 1
+    turnover = np.abs(np.diff(position, axis=0, prepend=0))
+    strategy_returns = position * returns - fee * turnover
+    equity = np.cumprod(1 + strategy_returns, axis=0)
+    drawdown = 1 - equity / np.maximum.accumulate(equity, axis=0)
+    std = strategy_returns.std(axis=0)
+    sharpe = np.divide(strategy_returns.mean(axis=0), std, out=np.zeros_like(std), where=std > 0)
+    return {
+        "total_return": equity[-1] - 1,
+        "sharpe": sharpe * np.sqrt(periods_per_year),
+        "max_drawdown": drawdown.max(axis=0),
+        "trades": np.count_nonzero(turnover, axis=0),
+    }
+
+
+def signal_trades(timestamps, coins, prices, signal, capital=1000.0, user="backtest"):
+    """
+    Turns a signal into trades in the layout of the trade ledger
+    (user, coin, amount, price, timestamp), in time order. Amounts are in
+    currency and sells have a negative amount: raising the signal by d buys
+    d * capital worth of the coin, and lowering it sells the same share of
+    the coins held, at that period's price.
+    """
+    change = np.diff(signal, axis=0, prepend=0)
+    rows, cols = np.nonzero(change)
+    price = prices[rows, cols]
+    delta = change[rows, cols]
+    amount = delta * capital
+    previous = signal[rows, cols] - delta
+    held = np.zeros(prices.shape[1])
+    for i, col in enumerate(cols.tolist()):
+        if delta[i] < 0 and previous[i] > 0:
+            # Sells the share of the holdings the signal gave up
+            sold = held[col] * -delta[i] / previous[i]
+            amount[i] = -sold * price[i]
+        held[col] += amount[i] / price[i]
+    return pd.DataFrame({
+        "user": user,
+        "coin": np.asarray(coins)[cols],
+        "amount": amount,
+        "price": price,
+        "timestamp": timestamps[rows],
+    })
+
+
+def record_trades(ledger, trades):
+    """
+    Appends the trades of signal_trades to a TradeLedger with a single write.
+    """
+    records = np.empty(len(trades), dtype=TRADE_DTYPE)
+    records["user"] = [TradeLedger._user_key(user).encode("utf-8") for user in trades["user"]]
+    records["coin"] = [coin.encode("utf-8")[:16] for coin in trades["coin"]]
+    records["amount"] = trades["amount"].to_numpy(dtype=np.float64)
+    records["price"] = trades["price"].to_numpy(dtype=np.float64)
+    stamps = pd.DatetimeIndex(trades["timestamp"])
+    seconds = (stamps.tz_convert(None) if stamps.tz else stamps).to_numpy(dtype="datetime64[s]").astype(np.int64)
+    if stamps.tz is None:
+        # Naive price times are local time, as the bulk importer reads them
+        seconds = seconds - local_utc_offsets(seconds - local_utc_offsets(seconds))
+    records["timestamp"] = seconds
+    ledger.extend_records(records)
+
+
+# --------------------------
+# Parameter sweeps
+# --------------------------
+
+_prices = None
+
+
+def _init_worker(path):
+    global _prices
+    _prices = np.load(path, mmap_mode="r")
+
+
+def _evaluate(job):
+    strategy, params, fee = job
+    metrics = run_backtest(_prices, STRATEGIES[strategy](_prices, **params), fee=fee)
+    return {**params, **{name: float(np.mean(values)) for name, values in metrics.items()}}
+
+
+def sweep(prices, strategy, grid, workers=None, fee=0.001):
+    """
+    Evaluates every combination of the parameter grid on a process pool.
+    Metrics are averaged across coins; results are sorted by Sharpe ratio.
+    """
+    if len(prices) < 2:
+        raise ValueError(f"at least 2 price rows are needed after dropping gaps, got {len(prices)}")
+    names = list(grid)
+    jobs = [(strategy, dict(zip(names, values)), fee) for values in itertools.product(*grid.values())]
+    # A bad configuration is rejected here rather than raising in a worker halfway through the sweep
+    for _, params, _ in jobs:
+        STRATEGIES[strategy](prices[:1], **params)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "prices.npy")
+        np.save(path, prices)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(path,)) as pool:
+            results = list(pool.map(_evaluate, jobs, chunksize=max(1, len(jobs) // (4 * (workers or os.cpu_count())))))
+    return pd.DataFrame(results).sort_values("sharpe", ascending=False, ignore_index=True)
+
+
+def _parse_grid(items):
+    grid = {}
+    for item in items:
+        name, values = item.split("=", 1)
+        grid[name] = [int(v) if v.lstrip("-").isdigit() else float(v) for v in values.split(",")]
+    return grid
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest CryptoWise strategies over historical prices.")
+    parser.add_argument("prices", help="CSV or Parquet price file")
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES), default="sma_crossover")
+    parser.add_argument("--grid", nargs="+", default=[], help="parameter ranges, e.g. fast=5,10 slow=50,100")
+    parser.add_argument("--fee", type=float, default=0.001)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", default="backtest_results.csv")
+    parser.add_argument("--ledger", help="trade ledger to record the best configuration's trades in")
+    parser.add_argument("--user", default="backtest", help="user the recorded trades belong to")
+    parser.add_argument("--capital", type=float, default=1000.0, help="currency per coin when fully long")
+    args = parser.parse_args()
+
+    timestamps, coins, prices = load_prices(args.prices)
+    grid = _parse_grid(args.grid)
+    try:
+        if args.ledger:
+            TradeLedger._user_key(args.user)
+        results = sweep(prices, args.strategy, grid, workers=args.workers, fee=args.fee)
+    except ValueError as e:
+        parser.error(str(e))
+    results.to_csv(args.output, index=False)
+    print(f"{len(results)} configurations over {len(coins)} coins, results in {args.output}")
+    print(results.head(10).to_string(index=False))
+
+    if args.ledger:
+        best = {name: type(values[0])(results.at[0, name]) for name, values in grid.items()}
+        signal = STRATEGIES[args.strategy](prices, **best)
+        trades = signal_trades(timestamps, coins, prices, signal, capital=args.capital, user=args.user)
+        record_trades(TradeLedger(args.ledger), trades)
+        print(f"{len(trades)} trades of {best} recorded in {args.ledger} for {args.user}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Candle ingestion throughput across many symbols.
+
+Feeds N ticks of S symbols through CandleAggregator, the way CryptoMarket
+rolls every tick into 1s/1m/1h/1d bars, and reports ticks per second both
+as price vectors (one per timestamp) and as symbol ticks. The same run is
+repeated through CryptoMarket.tick, which also simulates the prices. The
+memory preallocated for finished bars is reported per resolution, next to
+the resident set size after the run.
+
+Usage:
+    python benchmarks/candle_ingest.py --symbols 1000 --ticks 20000 --interval 0.25
+"""
+import argparse
+import os
+import resource
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+from cryptowise.market import CandleAggregator, CryptoMarket  # noqa: E402
+
+
+def mb(size):
+    return f"{size / 1024 / 1024:>9.1f} MB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark OHLCV candle ingestion.")
+    parser.add_argument("--symbols", type=int, default=1000)
+    parser.add_argument("--ticks", type=int, default=20_000, help="price vectors fed per run")
+    parser.add_argument("--interval", type=float, default=0.25, help="seconds between ticks")
+    parser.add_argument("--batch", type=int, default=100, help="ticks per CryptoMarket.tick call")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 1e-3, (args.ticks, args.symbols)), axis=0))
+    start = time.time() - args.ticks * args.interval
+    times = start + args.interval * np.arange(args.ticks)
+
+    aggregator = CandleAggregator(args.symbols)
+    began = time.perf_counter()
+    for timestamp, row in zip(times, prices):
+        aggregator.update(timestamp, row)
+    elapsed = time.perf_counter() - began
+    print(f"{args.ticks} ticks of {args.symbols} symbols, {args.interval:g}s apart")
+    print(f"  {'CandleAggregator.update':<32} {args.ticks / elapsed:>10,.0f} ticks/s "
+          f"{args.ticks * args.symbols / elapsed:>14,.0f} symbol ticks/s")
+
+    market = CryptoMarket(prices={f"COIN{i}": 100.0 for i in range(args.symbols)},
+                          tick_interval=args.interval, seed=0)
+    now = time.time()
+    began = time.perf_counter()
+    for step in range(0, args.ticks, args.batch):
+        market.tick(args.batch, now=now + (step + args.batch) * args.interval)
+    elapsed = time.perf_counter() - began
+    print(f"  {f'CryptoMarket.tick ({args.batch}/call)':<32} {args.ticks / elapsed:>10,.0f} ticks/s "
+          f"{args.ticks * args.symbols / elapsed:>14,.0f} symbol ticks/s")
+
+    print("finished-bar buffers per aggregator")
+    total = 0
+    for name, series in aggregator.series.items():
+        size = series.bars.nbytes + series.times.nbytes + series.current.nbytes
+        total += size
+        print(f"  {name:<4} {len(series.times):>6} bars {mb(size)}")
+    print(f"  total            {mb(total)}")
+    # ru_maxrss is in kilobytes on Linux
+    print(f"peak RSS           {mb(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024)}")
+
+
+if __name__ == "__main__":
+    main()
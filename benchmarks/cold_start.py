@@ -0,0 +1,89 @@
+"""
+Cold-start and first-render budget check for CryptoWise.
+
+For every page, starts a fresh interpreter, renders Home through Streamlit's
+AppTest harness and then navigates to the page. Reports the time to import
+the harness, the first Home render, the first render of the page, and which
+heavy modules ended up loaded. Exits with status 1 when a page goes over
+its budget or Home pulls in a heavy dependency.
+
+Usage:
+    python benchmarks/cold_start.py
+    python benchmarks/cold_start.py --pages Home Login --first-render-budget 1.5
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+PAGES = ["Home", "Register", "Login", "Trading", "Benefits", "Risks", "Solutions",
+         "Logout", "Settings", "Reminder", "Download", "Crypto details", "Upload Image",
+         "Import trades", "Search"]
+HEAVY_MODULES = ("numpy", "pandas", "openpyxl")
+# st.image itself imports numpy, so only pandas and openpyxl are held against light pages
+LIGHT_PAGE_FORBIDDEN = ("pandas", "openpyxl")
+LIGHT_PAGES = ("Home", "Register", "Login", "Logout", "Benefits", "Solutions", "Settings", "Search")
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+imported = time.perf_counter()
+app = AppTest.from_file(sys.argv[1], default_timeout=60)
+app.run()
+home = time.perf_counter()
+if sys.argv[2] != "Home":
+    app.sidebar.selectbox[0].select(sys.argv[2]).run()
+page = time.perf_counter()
+print(json.dumps({
+    "harness_import_s": imported - start,
+    "home_first_render_s": home - imported,
+    "page_first_render_s": page - home,
+    "heavy_modules": [m for m in sys.argv[3:] if m in sys.modules],
+    "error": app.exception[0].message if app.exception else None,
+}))
+"""
+
+
+def probe(page, directory):
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE, APP_PATH, page, *HEAVY_MODULES],
+        cwd=directory, capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold start and first render per page.")
+    parser.add_argument("--pages", nargs="+", default=PAGES, choices=PAGES)
+    parser.add_argument("--home-budget", type=float, default=1.0, help="seconds for the first Home render")
+    parser.add_argument("--first-render-budget", type=float, default=2.0, help="seconds for a page's first render")
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'page':<16} {'import s':>9} {'home s':>8} {'page s':>8}  heavy modules")
+    with tempfile.TemporaryDirectory() as directory:
+        for page in args.pages:
+            stats = probe(page, directory)
+            print(f"{page:<16} {stats['harness_import_s']:>9.2f} {stats['home_first_render_s']:>8.2f} "
+                  f"{stats['page_first_render_s']:>8.2f}  {', '.join(stats['heavy_modules']) or '-'}")
+            if stats["error"]:
+                failures.append(f"{page}: {stats['error']}")
+            if stats["home_first_render_s"] > args.home_budget:
+                failures.append(f"{page}: Home first render over {args.home_budget}s")
+            if stats["page_first_render_s"] > args.first_render_budget:
+                failures.append(f"{page}: first render over {args.first_render_budget}s")
+            forbidden = [m for m in stats["heavy_modules"] if m in LIGHT_PAGE_FORBIDDEN]
+            if page in LIGHT_PAGES and forbidden:
+                failures.append(f"{page}: loaded {', '.join(forbidden)}")
+
+    for failure in failures:
+        print(f"over budget: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Export throughput and peak memory per format.
+
+Writes N trades for one user to a temporary ledger, then exports them in
+each format the way the Download page does (trade_row_chunks into
+export_rows, to a file on disk). Every format runs in a fresh interpreter
+and its memory is sampled while the export runs. The resident set size
+before and at its peak is reported, and so is its anonymous part: the rest
+is the memory-mapped ledger, whose pages are read once and can be dropped
+by the kernel. Output size, MB/s and rows/s are reported per format.
+
+Usage:
+    python benchmarks/export_throughput.py --rows 5000000
+    python benchmarks/export_throughput.py --rows 1000000 --formats CSV JSON
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+
+from cryptowise.ledger import HISTORY_COLUMNS, TRADE_DTYPE, TradeLedger  # noqa: E402
+
+COINS = np.array([b"Bitcoin", b"Ethereum", b"Solana", b"Ripple"], dtype="S16")
+FORMATS = ["JSON", "CSV", "Excel"]
+
+
+def mb(size):
+    return f"{size / 1024 ** 2:.0f} MB"
+
+
+def fill_ledger(path, rows, batch=1_000_000):
+    ledger = TradeLedger(path)
+    rng = np.random.default_rng(0)
+    start = int(time.time()) - rows
+    for offset in range(0, rows, batch):
+        count = min(batch, rows - offset)
+        records = np.empty(count, dtype=TRADE_DTYPE)
+        records["user"] = b"alice"
+        records["coin"] = COINS[rng.integers(0, len(COINS), count)]
+        records["amount"] = np.round(rng.uniform(-100, 100, count), 2)
+        records["price"] = np.round(rng.uniform(1, 70_000, count), 4)
+        records["timestamp"] = start + offset + np.arange(count)
+        ledger.extend_records(records)
+
+
+def memory():
+    """
+    Returns the resident set size and its anonymous part, in bytes. The
+    rest is file pages such as the memory-mapped ledger, which the kernel
+    can drop at any time.
+    """
+    with open("/proc/self/status") as f:
+        fields = dict(line.split(":", 1) for line in f)
+    return int(fields["VmRSS"].split()[0]) * 1024, int(fields["RssAnon"].split()[0]) * 1024
+
+
+def export_once(ledger_path, file_format, out_path):
+    """
+    Runs one export in this process and prints its measurements as JSON.
+    Memory is sampled every 10 ms while the export runs.
+    """
+    from cryptowise.exports import export_rows, trade_row_chunks
+
+    ledger = TradeLedger(ledger_path)
+    before = memory()
+    peak = list(before)
+    done = threading.Event()
+
+    def sample():
+        while not done.wait(0.01):
+            peak[:] = map(max, peak, memory())
+
+    sampler = threading.Thread(target=sample)
+    sampler.start()
+    start = time.perf_counter()
+    with open(out_path, "wb") as out:
+        export_rows(file_format, HISTORY_COLUMNS, trade_row_chunks(ledger, "alice"), out)
+    elapsed = time.perf_counter() - start
+    done.set()
+    sampler.join()
+    after = memory()
+    print(json.dumps({
+        "seconds": elapsed,
+        "bytes": os.path.getsize(out_path),
+        "rss_before": before[0],
+        "rss_peak": max(peak[0], after[0]),
+        "anon_before": before[1],
+        "anon_peak": max(peak[1], after[1]),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark streamed exports per format.")
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--formats", nargs="+", default=FORMATS, choices=FORMATS)
+    parser.add_argument("--child", nargs=3, metavar=("LEDGER", "FORMAT", "OUT"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        export_once(*args.child)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        ledger_path = os.path.join(directory, "trades.ledger")
+        fill_ledger(ledger_path, args.rows)
+        print(f"{args.rows} trade rows")
+        print(f"  {'format':<6} {'seconds':>8} {'output':>10} {'MB/s':>7} {'rows/s':>10} "
+              f"{'RSS before':>11} {'peak RSS':>9} {'anon before':>12} {'peak anon':>10}")
+        for file_format in args.formats:
+            out_path = os.path.join(directory, f"export.{file_format.lower()}")
+            result = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--child", ledger_path, file_format, out_path],
+                capture_output=True, text=True, check=True,
+            )
+            stats = json.loads(result.stdout.strip().splitlines()[-1])
+            size = stats["bytes"] / 1024 ** 2
+            print(f"  {file_format:<6} {stats['seconds']:>8.1f} {mb(stats['bytes']):>10} {size / stats['seconds']:>7.1f} "
+                  f"{args.rows / stats['seconds']:>10,.0f} {mb(stats['rss_before']):>11} {mb(stats['rss_peak']):>9} "
+                  f"{mb(stats['anon_before']):>12} {mb(stats['anon_peak']):>10}")
+            os.remove(out_path)
+
+
+if __name__ == "__main__":
+    main()
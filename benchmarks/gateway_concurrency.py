@@ -0,0 +1,154 @@
+"""
+Concurrency benchmark for the trade submission gateway.
+
+Runs N threads submitting market orders through TradeGateway into a
+temporary ledger, once per group-commit window, and reports throughput,
+latency percentiles and how many trades each ledger write carried. A share
+of the orders is submitted twice at once with the same idempotency key;
+the run fails if any of them reaches the ledger twice. A final phase lets
+one user flood the gateway alongside well-behaved users and reports how
+many orders each side got through the token buckets.
+
+Usage:
+    python benchmarks/gateway_concurrency.py --threads 32 --orders 200 --windows 0 0.002 0.01
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+from cryptowise.gateway import RateLimitExceeded, TradeGateway  # noqa: E402
+from cryptowise.ledger import GroupCommitter, TradeLedger  # noqa: E402
+from cryptowise.market import CryptoMarket  # noqa: E402
+from cryptowise.orders import MatchingEngine  # noqa: E402
+
+
+def run_threads(count, target):
+    threads = [threading.Thread(target=target, args=(i,)) for i in range(count)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def burst(directory, window, threads, orders, duplicates):
+    ledger = TradeLedger(os.path.join(directory, f"burst_{window}.ledger"))
+    writer = GroupCommitter(ledger, window=window)
+    market = CryptoMarket(seed=1)
+    gateway = TradeGateway(MatchingEngine(market, writer), user_rate=1e9, user_burst=1e9,
+                           global_rate=1e9, global_burst=1e9)
+    latencies = [[] for _ in range(threads)]
+    rng = np.random.default_rng(0)
+    repeat = rng.random((threads, orders)) < duplicates
+
+    def worker(i):
+        user = f"user{i}"
+        for j in range(orders):
+            copies = 2 if repeat[i, j] else 1
+            results = []
+
+            def submit():
+                results.append(gateway.submit(user, "Bitcoin", "buy", 0.001, key=f"{i}:{j}"))
+
+            start = time.perf_counter()
+            extra = [threading.Thread(target=submit) for _ in range(copies - 1)]
+            for thread in extra:
+                thread.start()
+            submit()
+            for thread in extra:
+                thread.join()
+            latencies[i].append(time.perf_counter() - start)
+
+    elapsed = run_threads(threads, worker)
+    submitted = threads * orders
+    latency = np.concatenate(latencies) * 1000
+    return {
+        "window_ms": window * 1000,
+        "orders_per_s": submitted / elapsed,
+        "p50_ms": np.percentile(latency, 50),
+        "p99_ms": np.percentile(latency, 99),
+        "writes": writer.batches,
+        "trades_per_write": len(ledger) / max(writer.batches, 1),
+        "duplicates": int(repeat.sum()),
+        "recorded": len(ledger),
+        "expected": submitted,
+    }
+
+
+def flood(directory, seconds, users, user_rate, global_rate):
+    ledger = TradeLedger(os.path.join(directory, "flood.ledger"))
+    gateway = TradeGateway(MatchingEngine(CryptoMarket(seed=1), GroupCommitter(ledger)),
+                           user_rate=user_rate, user_burst=2 * user_rate,
+                           global_rate=global_rate, global_burst=2 * global_rate)
+    accepted = [0] * (users + 1)
+    rejected = [0] * (users + 1)
+    deadline = time.perf_counter() + seconds
+
+    def worker(i):
+        # Thread 0 submits as fast as it can; the others at half their allowed rate
+        pause = 0 if i == 0 else 2 / user_rate
+        while time.perf_counter() < deadline:
+            try:
+                gateway.submit(f"user{i}", "Bitcoin", "buy", 0.001)
+                accepted[i] += 1
+            except RateLimitExceeded:
+                rejected[i] += 1
+            if pause:
+                time.sleep(pause)
+
+    elapsed = run_threads(users + 1, worker)
+    return elapsed, accepted, rejected, len(ledger)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent submissions through the trade gateway.")
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--orders", type=int, default=200, help="orders per thread")
+    parser.add_argument("--duplicates", type=float, default=0.2, help="share of orders submitted twice")
+    parser.add_argument("--windows", type=float, nargs="+", default=[0.0, 0.002, 0.01],
+                        help="group-commit windows in seconds")
+    parser.add_argument("--flood-seconds", type=float, default=3.0)
+    parser.add_argument("--flood-users", type=int, default=8)
+    parser.add_argument("--user-rate", type=float, default=5.0)
+    parser.add_argument("--global-rate", type=float, default=200.0)
+    args = parser.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"{args.threads} threads x {args.orders} orders, {args.duplicates:.0%} submitted twice")
+        print(f"{'window ms':>9} {'orders/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'writes':>8} {'trades/write':>13}")
+        for window in args.windows:
+            stats = burst(directory, window, args.threads, args.orders, args.duplicates)
+            print(f"{stats['window_ms']:>9.1f} {stats['orders_per_s']:>10.0f} {stats['p50_ms']:>8.2f} "
+                  f"{stats['p99_ms']:>8.2f} {stats['writes']:>8} {stats['trades_per_write']:>13.1f}")
+            if stats["recorded"] != stats["expected"]:
+                failures.append(f"window {stats['window_ms']} ms: {stats['recorded']} trades recorded, "
+                                f"expected {stats['expected']} ({stats['duplicates']} duplicated submissions)")
+
+        elapsed, accepted, rejected, recorded = flood(
+            directory, args.flood_seconds, args.flood_users, args.user_rate, args.global_rate)
+        print(f"flood for {elapsed:.1f}s, {args.user_rate:g} orders/s per user, {args.global_rate:g} global")
+        print(f"  flooding user   {accepted[0]:>6} accepted {rejected[0]:>9} rejected")
+        print(f"  other users     {sum(accepted[1:]) / args.flood_users:>6.0f} accepted "
+              f"{sum(rejected[1:]) / args.flood_users:>9.0f} rejected (mean)")
+        limit = args.user_rate * (elapsed + 2)
+        if accepted[0] > limit:
+            failures.append(f"flooding user got {accepted[0]} orders through, limit {limit:.0f}")
+        if recorded != sum(accepted):
+            failures.append(f"flood: {recorded} trades recorded for {sum(accepted)} accepted orders")
+
+    for failure in failures:
+        print(f"failed: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Translation lookup throughput and per-page render overhead.
+
+Compares the original get_localized_text, which built the whole
+three-language dict literal on every call, with the catalog lookups of
+cryptowise.i18n: get_localized_text and a translator bound to one language.
+The original is rebuilt from the catalog files as the same dict literal.
+
+It then renders pages through Streamlit's AppTest harness, once with the
+pages' lookups swapped for the original and once as they are, and reports
+the median warm render time of each page both ways.
+
+Usage:
+    python benchmarks/i18n_lookup.py --lookups 200000 --renders 30
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from cryptowise import i18n  # noqa: E402
+
+APP_PATH = os.path.join(ROOT, "app.py")
+PAGES = ["Home", "Register", "Login", "Trading", "Settings", "Benefits"]
+PAGE_MODULES = ["home", "auth", "trading", "settings", "education", "details", "download", "images"]
+
+
+def original_lookup():
+    """
+    Compiles the original get_localized_text, with the catalogs written out
+    as the dict literal it rebuilt on every call.
+    """
+    translations = {}
+    for language in i18n.LANGUAGES:
+        with open(os.path.join(i18n.LOCALES_DIR, f"{language}.json"), encoding="utf-8") as f:
+            translations[language] = json.load(f)
+    source = (
+        "def get_localized_text(language, key):\n"
+        f"    translations = {translations!r}\n"
+        "    return translations.get(language, translations['en']).get(key, key)\n"
+    )
+    namespace = {}
+    exec(source, namespace)
+    return namespace["get_localized_text"]
+
+
+def lookups_per_second(lookup, keys, count):
+    languages = i18n.LANGUAGES
+    calls = [(languages[i % len(languages)], keys[i % len(keys)]) for i in range(count)]
+    elapsed = min(timeit.repeat(lambda: [lookup(language, key) for language, key in calls], number=1, repeat=3))
+    return count / elapsed
+
+
+def use_lookups(get_localized_text, get_translator):
+    for name in PAGE_MODULES:
+        module = sys.modules.get(f"cryptowise.pages.{name}")
+        if module is None:
+            continue
+        if hasattr(module, "get_localized_text"):
+            module.get_localized_text = get_localized_text
+        if hasattr(module, "get_translator"):
+            module.get_translator = get_translator
+
+
+def render_times(app, page, renders):
+    app.sidebar.selectbox[0].select(page).run()
+    times = []
+    for _ in range(renders):
+        start = time.perf_counter()
+        app.run()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark translation lookups and page renders.")
+    parser.add_argument("--lookups", type=int, default=200_000)
+    parser.add_argument("--renders", type=int, default=30, help="warm renders per page and variant")
+    parser.add_argument("--pages", nargs="+", default=PAGES)
+    args = parser.parse_args()
+
+    original = original_lookup()
+    keys = list(i18n.load_catalog("en"))
+    bound = {language: i18n.get_translator(language) for language in i18n.LANGUAGES}
+    print(f"{args.lookups} lookups over {len(keys)} keys and {len(i18n.LANGUAGES)} languages")
+    for name, lookup in [
+        ("original (dict literal per call)", original),
+        ("get_localized_text", i18n.get_localized_text),
+        ("translator bound to a language", lambda language, key: bound[language](key)),
+    ]:
+        print(f"  {name:<34} {lookups_per_second(lookup, keys, args.lookups):>14,.0f} lookups/s")
+
+    from streamlit.testing.v1 import AppTest
+
+    os.chdir(tempfile.mkdtemp())
+    app = AppTest.from_file(APP_PATH, default_timeout=60)
+    app.run()
+    for page in args.pages:
+        # Imports the page module so its lookups can be swapped
+        app.sidebar.selectbox[0].select(page).run()
+    print(f"median warm render of {args.renders} runs")
+    print(f"  {'page':<12} {'original ms':>12} {'catalog ms':>12}")
+    for page in args.pages:
+        use_lookups(original, lambda language: lambda key: original(language, key))
+        before = render_times(app, page, args.renders)
+        use_lookups(i18n.get_localized_text, i18n.get_translator)
+        after = render_times(app, page, args.renders)
+        print(f"  {page:<12} {before:>12.2f} {after:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
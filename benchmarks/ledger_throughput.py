@@ -0,0 +1,102 @@
+"""
+Append throughput and per-user read latency of the trade ledger.
+
+Fills a temporary ledger with N trades spread over a number of users, in
+batches through TradeLedger.extend_records, and times a smaller run of
+single-trade appends through TradeLedger.extend, the path a trade on the
+trading page takes. The ledger is then reopened, which rebuilds the
+per-user offset index, and one user's records are read back for random
+users: all of them, and the latest 100 as the history page does after a
+new trade.
+
+Usage:
+    python benchmarks/ledger_throughput.py --trades 10000000 --users 1000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+from cryptowise.ledger import TRADE_DTYPE, TradeLedger  # noqa: E402
+
+COINS = np.array([b"Bitcoin", b"Ethereum", b"Solana", b"Ripple"], dtype="S16")
+
+
+def make_records(rng, count, users, start):
+    records = np.empty(count, dtype=TRADE_DTYPE)
+    records["user"] = users[rng.integers(0, len(users), count)]
+    records["coin"] = COINS[rng.integers(0, len(COINS), count)]
+    records["amount"] = rng.uniform(-100, 100, count)
+    records["price"] = rng.uniform(1, 70_000, count)
+    records["timestamp"] = start + np.arange(count)
+    return records
+
+
+def percentiles(seconds):
+    ms = np.asarray(seconds) * 1000
+    return f"p50 {np.percentile(ms, 50):8.3f} ms  p99 {np.percentile(ms, 99):8.3f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark trade ledger appends and per-user reads.")
+    parser.add_argument("--trades", type=int, default=10_000_000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--batch", type=int, default=100_000, help="records per extend_records call")
+    parser.add_argument("--single", type=int, default=100_000, help="trades appended one at a time")
+    parser.add_argument("--reads", type=int, default=200, help="users read back")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    users = np.array([f"user{i}".encode() for i in range(args.users)], dtype="S32")
+    start = int(time.time()) - args.trades
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "trades.ledger")
+        ledger = TradeLedger(path)
+
+        elapsed = 0.0
+        for offset in range(0, args.trades, args.batch):
+            records = make_records(rng, min(args.batch, args.trades - offset), users, start + offset)
+            began = time.perf_counter()
+            ledger.extend_records(records)
+            elapsed += time.perf_counter() - began
+        print(f"{len(ledger)} trades over {args.users} users, {os.path.getsize(path) / 1024 ** 2:,.0f} MB on disk")
+        print(f"  extend_records ({args.batch} per call) {len(ledger) / elapsed:>14,.0f} trades/s")
+
+        now = datetime.now()
+        trade = {"user": "user0", "coin": "Bitcoin", "amount": 10.0, "price": 64_000.0, "timestamp": now}
+        latencies = []
+        for _ in range(args.single):
+            began = time.perf_counter()
+            ledger.append(trade)
+            latencies.append(time.perf_counter() - began)
+        print(f"  append (1 per call)               {args.single / sum(latencies):>14,.0f} trades/s  "
+              f"{percentiles(latencies)}")
+
+        began = time.perf_counter()
+        ledger = TradeLedger(path)
+        print(f"reopen and rebuild the user index   {time.perf_counter() - began:>14.3f} s")
+
+        sample = rng.choice(users, min(args.reads, args.users), replace=False)
+        full, latest, counts = [], [], []
+        for user in sample:
+            user = user.decode()
+            began = time.perf_counter()
+            counts.append(len(ledger.user_records(user)))
+            full.append(time.perf_counter() - began)
+            version = ledger.user_version(user)
+            began = time.perf_counter()
+            ledger.user_records(user, max(version - 100, 0))
+            latest.append(time.perf_counter() - began)
+        print(f"per-user read, all {np.mean(counts):,.0f} records   {percentiles(full)}")
+        print(f"per-user read, latest 100 records  {percentiles(latest)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Headless multi-session load test for CryptoWise.
+
+Drives app.py through Streamlit's AppTest harness with N concurrent
+sessions, each going register -> login -> trade -> history -> download,
+and reports rerun latency percentiles per step, throughput and memory
+growth per session. Runs offline; all data files are written to a
+temporary working directory.
+
+Usage:
+    python benchmarks/load_test.py --sessions 20 --trades 5
+    python benchmarks/load_test.py --save-baseline      # record the current numbers
+    python benchmarks/load_test.py                      # compare against the baseline
+
+Exits with status 1 when a p95 latency regresses by more than --tolerance.
+"""
+import argparse
+import collections
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+from streamlit.testing.v1 import AppTest
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+def rss_bytes():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+class Session:
+    """
+    One simulated browser session. Every rerun is timed under its step name.
+    """
+    def __init__(self, index, timings, timeout):
+        self.username = f"user{index}"
+        self.timings = timings
+        self.app = AppTest.from_file(APP_PATH, default_timeout=timeout)
+
+    def _run(self, step, action):
+        start = time.perf_counter()
+        action().run()
+        self.timings[step].append(time.perf_counter() - start)
+        if self.app.exception:
+            raise RuntimeError(f"{self.username} failed at {step}: {self.app.exception[0].message}")
+
+    def _navigate(self, page):
+        self._run(f"open {page}", lambda: self.app.sidebar.selectbox[0].select(page))
+
+    def flow(self, trades):
+        app = self.app
+        self._run("first render", lambda: app)
+
+        self._navigate("Register")
+        app.text_input(key="reg_username").input(self.username)
+        app.text_input(key="reg_email").input(f"{self.username}@example.com")
+        app.text_input(key="reg_password").input("secret")
+        self._run("register", lambda: app.button[0].click())
+
+        self._navigate("Login")
+        app.text_input(key="login_username").input(self.username)
+        app.text_input(key="login_password").input("secret")
+        self._run("login", lambda: app.button[0].click())
+
+        self._navigate("Trading")
+        for i in range(trades):
+            # A distinct amount per click, so back-to-back clicks are separate orders rather than a double click
+            app.number_input[0].set_value(10.0 + i)
+            self._run("trade", lambda: app.button[0].click())
+
+        self._navigate("Crypto details")
+        self._navigate("Download")
+
+
+def run(sessions, trades, timeout):
+    timings = collections.defaultdict(list)
+    errors = []
+    rss_before = rss_bytes()
+    clients = [Session(i, timings, timeout) for i in range(sessions)]
+
+    def worker(client):
+        try:
+            client.flow(trades)
+        except Exception as e:
+            errors.append(str(e))
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(client,)) for client in clients]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    reruns = sum(len(values) for values in timings.values())
+    return {
+        "sessions": sessions,
+        "trades_per_session": trades,
+        "errors": errors,
+        "elapsed_s": elapsed,
+        "flows_per_s": (sessions - len(errors)) / elapsed,
+        "reruns_per_s": reruns / elapsed,
+        "rss_growth_per_session_kb": (rss_bytes() - rss_before) / sessions / 1024,
+        "steps": {
+            step: {f"p{q}_ms": float(np.percentile(values, q) * 1000) for q in (50, 95, 99)}
+            for step, values in timings.items()
+        },
+    }
+
+
+def report(results, baseline, tolerance):
+    print(f"{results['sessions']} sessions, {results['trades_per_session']} trades each, "
+          f"{results['elapsed_s']:.1f}s: {results['flows_per_s']:.2f} flows/s, "
+          f"{results['reruns_per_s']:.1f} reruns/s, "
+          f"{results['rss_growth_per_session_kb']:.0f} KB RSS growth per session")
+    print(f"{'step':<22} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'baseline p95':>13}")
+    regressions = []
+    for step, stats in results["steps"].items():
+        base = baseline.get("steps", {}).get(step, {}).get("p95_ms")
+        print(f"{step:<22} {stats['p50_ms']:>9.1f} {stats['p95_ms']:>9.1f} {stats['p99_ms']:>9.1f} "
+              f"{base if base is None else round(base, 1)!s:>13}")
+        if base is not None and stats["p95_ms"] > base * (1 + tolerance):
+            regressions.append(step)
+    for error in results["errors"]:
+        print(f"error: {error}")
+    if regressions:
+        print(f"p95 regressions beyond {tolerance:.0%}: {', '.join(regressions)}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless multi-session load test for app.py.")
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--trades", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed p95 slowdown, e.g. 0.25 for 25%%")
+    args = parser.parse_args()
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    # The app writes its ledger and user database to the working directory
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        results = run(args.sessions, args.trades, args.timeout)
+
+    regressions = report(results, baseline, args.tolerance)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"baseline saved to {args.baseline}")
+    sys.exit(1 if regressions or results["errors"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Login throughput and latency under concurrent logins.
+
+Registers N users in a temporary user store, then starts N threads that
+each log in once at the same moment: a repository lookup followed by
+User.check_password, the same calls the Login page makes. Reports logins
+per second and latency percentiles, for every hashing pool size given.
+Latency includes the time a login waits for a free hashing worker.
+
+Usage:
+    python benchmarks/login_concurrency.py --logins 200 --workers 1 4 8
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+from cryptowise import users as users_module  # noqa: E402
+from cryptowise.users import PasswordHasher, User, UserRepository  # noqa: E402
+
+
+def run(directory, logins, workers, iterations):
+    hasher = PasswordHasher(iterations=iterations, workers=workers)
+    repository = UserRepository(os.path.join(directory, f"users_{workers}.db"))
+    # check_password looks both up through their cached getters
+    users_module.get_password_hasher = lambda: hasher
+    users_module.get_user_repository = lambda: repository
+    # Every login still derives its own key; only registration is shared
+    record = hasher.hash("password")
+    for i in range(logins):
+        repository.add(User(str(i), f"user{i}", "a@b", record))
+
+    latencies = [0.0] * logins
+    failures = []
+    barrier = threading.Barrier(logins + 1)
+
+    def login(i):
+        barrier.wait()
+        start = time.perf_counter()
+        user = repository.get(f"user{i}")
+        if user is None or not user.check_password("password"):
+            failures.append(i)
+        latencies[i] = time.perf_counter() - start
+
+    threads = [threading.Thread(target=login, args=(i,)) for i in range(logins)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    ms = np.asarray(latencies) * 1000
+    return logins / elapsed, np.percentile(ms, 50), np.percentile(ms, 99), failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent logins.")
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8], help="hashing pool sizes")
+    parser.add_argument("--iterations", type=int, default=PasswordHasher().iterations, help="PBKDF2 work factor")
+    args = parser.parse_args()
+
+    failed = False
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"{args.logins} concurrent logins, PBKDF2-SHA256 with {args.iterations} iterations")
+        print(f"  {'workers':>7} {'logins/s':>9} {'p50 ms':>9} {'p99 ms':>9}")
+        for workers in args.workers:
+            rate, p50, p99, failures = run(directory, args.logins, workers, args.iterations)
+            print(f"  {workers:>7} {rate:>9.1f} {p50:>9.1f} {p99:>9.1f}")
+            if failures:
+                print(f"failed: {len(failures)} logins with {workers} workers were refused")
+                failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
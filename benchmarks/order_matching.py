@@ -0,0 +1,129 @@
+"""
+Headless throughput of the order books and the matching engine.
+
+Simulated market makers quote limit orders on both sides around a drifting
+mid price, takers send marketable limit and market orders, and a share of
+the resting orders is cancelled. The same pre-generated order flow is run
+through a bare OrderBook, through MatchingEngine without a ledger and
+through MatchingEngine recording fills in a temporary TradeLedger, and the
+orders per second of each are reported. Exits with status 1 when the
+engine without a ledger stays under --target orders/s.
+
+Usage:
+    python benchmarks/order_matching.py --orders 500000 --target 100000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+from cryptowise.ledger import TradeLedger  # noqa: E402
+from cryptowise.market import CryptoMarket  # noqa: E402
+from cryptowise.orders import MatchingEngine, OrderBook  # noqa: E402
+
+MAKERS = 20
+TAKERS = 50
+
+
+def order_flow(count, seed, cancel_share, market_share, taker_share):
+    """
+    Returns the flow as (user, side, quantity, price or None, id to cancel
+    or 0) tuples. Orders are numbered from 1 in submission order, as the
+    engine numbers them; cancels pick one of the orders before them.
+    """
+    rng = np.random.default_rng(seed)
+    mid = 100.0 * np.exp(np.cumsum(rng.normal(0, 1e-4, count)))
+    kind = rng.random(count)
+    buy = rng.random(count) < 0.5
+    quantity = np.round(rng.uniform(0.01, 1.0, count), 4)
+    # Makers quote up to 20 ticks away from the mid; takers cross it by up to 5
+    offset = rng.integers(1, 21, count) * 0.01
+    cross = rng.integers(0, 6, count) * 0.01
+    pick = rng.random(count)
+    flow = []
+    submitted = 0
+    for i in range(count):
+        side = "buy" if buy[i] else "sell"
+        if kind[i] < cancel_share and submitted:
+            flow.append((f"maker{i % MAKERS}", side, 0.0, None, int(pick[i] * submitted) + 1))
+            continue
+        submitted += 1
+        if kind[i] < cancel_share + market_share:
+            flow.append((f"taker{i % TAKERS}", side, float(quantity[i]), None, 0))
+        elif kind[i] < cancel_share + market_share + taker_share:
+            price = mid[i] + cross[i] if buy[i] else mid[i] - cross[i]
+            flow.append((f"taker{i % TAKERS}", side, float(quantity[i]), round(float(price), 2), 0))
+        else:
+            price = mid[i] - offset[i] if buy[i] else mid[i] + offset[i]
+            flow.append((f"maker{i % MAKERS}", side, float(quantity[i]), round(float(price), 2), 0))
+    return flow
+
+
+def run_book(flow):
+    book = OrderBook("Bitcoin")
+    fills = 0
+    i = 0
+    start = time.perf_counter()
+    for user, side, quantity, price, cancel in flow:
+        if cancel:
+            book.cancel(cancel)
+            continue
+        i += 1
+        if price is None:
+            # A bare book has no market to fill the rest, so market orders only take liquidity
+            price = float("inf") if side == "buy" else 0.0
+        order = {"id": i, "user": user, "side": side, "price": price, "quantity": quantity, "remaining": quantity}
+        fills += len(book.submit(order))
+        if order["remaining"] > 0 and price in (0.0, float("inf")):
+            book.cancel(i)
+    return time.perf_counter() - start, fills
+
+
+def run_engine(flow, ledger=None):
+    engine = MatchingEngine(CryptoMarket(prices={"Bitcoin": 100.0}, seed=0), ledger)
+    trades = 0
+    start = time.perf_counter()
+    for user, side, quantity, price, cancel in flow:
+        if cancel:
+            engine.cancel("Bitcoin", cancel)
+        else:
+            trades += len(engine.submit(user, "Bitcoin", side, quantity, price)[1])
+    return time.perf_counter() - start, trades
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark order matching throughput.")
+    parser.add_argument("--orders", type=int, default=500_000)
+    parser.add_argument("--cancel-share", type=float, default=0.2)
+    parser.add_argument("--market-share", type=float, default=0.05)
+    parser.add_argument("--taker-share", type=float, default=0.15, help="share of marketable limit orders")
+    parser.add_argument("--target", type=float, default=100_000, help="orders/s required of the engine")
+    args = parser.parse_args()
+
+    flow = order_flow(args.orders, 0, args.cancel_share, args.market_share, args.taker_share)
+    print(f"{args.orders} orders: {args.cancel_share:.0%} cancels, {args.market_share:.0%} market, "
+          f"{args.taker_share:.0%} marketable limit, the rest resting limit")
+
+    elapsed, fills = run_book(flow)
+    print(f"  {'OrderBook':<30} {args.orders / elapsed:>12,.0f} orders/s {fills:>10} fills")
+    elapsed, trades = run_engine(flow)
+    rate = args.orders / elapsed
+    print(f"  {'MatchingEngine, no ledger':<30} {rate:>12,.0f} orders/s {trades:>10} trades")
+    with tempfile.TemporaryDirectory() as directory:
+        ledger = TradeLedger(os.path.join(directory, "trades.ledger"))
+        elapsed, trades = run_engine(flow, ledger)
+        print(f"  {'MatchingEngine, TradeLedger':<30} {args.orders / elapsed:>12,.0f} orders/s "
+              f"{len(ledger):>10} recorded")
+
+    if rate < args.target:
+        print(f"failed: {rate:,.0f} orders/s is under the target of {args.target:,.0f}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
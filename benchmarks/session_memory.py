@@ -0,0 +1,109 @@
+"""
+Per-session memory of trade history, reminders and users.
+
+Writes N trades for one user to a temporary ledger and compares the memory
+held by the original representation (a dict per trade with a formatted
+timestamp string, and the object-column DataFrame built from it) with the
+typed columns of TradeHistoryView. Reminders are compared as dicts, as one
+slotted object each and as the typed columns of ReminderTable, and User
+objects with and without __slots__.
+
+Usage:
+    python benchmarks/session_memory.py --trades 100000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd  # noqa: E402
+
+from cryptowise.history import TradeHistoryView  # noqa: E402
+from cryptowise.ledger import TradeLedger  # noqa: E402
+from cryptowise.reminders import Reminder, ReminderTable  # noqa: E402
+from cryptowise.users import User  # noqa: E402
+
+COINS = ["Bitcoin", "Ethereum", "Solana", "Ripple"]
+
+
+def allocated(build):
+    """
+    Returns the object built by `build` and the bytes it allocated.
+    """
+    tracemalloc.start()
+    obj = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return obj, size
+
+
+def mb(size):
+    return f"{size / 1024 / 1024:>9.2f} MB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-session memory of trades and reminders.")
+    parser.add_argument("--trades", type=int, default=100_000)
+    args = parser.parse_args()
+
+    start = datetime.now()
+    trades = [{"user": "alice", "coin": COINS[i % 4], "amount": 10.0 + i, "price": 100.0 + i,
+               "timestamp": start + timedelta(seconds=i)} for i in range(args.trades)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        ledger = TradeLedger(os.path.join(directory, "trades.ledger"))
+        ledger.extend(trades)
+
+        dict_rows, dict_bytes = allocated(lambda: [
+            {**t, "timestamp": t["timestamp"].strftime("%Y-%m-%d %H:%M:%S")} for t in trades
+        ])
+        object_df = pd.DataFrame(dict_rows)[["timestamp", "coin", "price", "amount"]]
+
+        view, view_bytes = allocated(lambda: TradeHistoryView("alice"))
+        view.refresh(ledger)
+        typed_df = view.df
+
+    reminder_dicts, reminder_dict_bytes = allocated(lambda: [
+        {"user": "alice", "message": "", "time": (start + timedelta(seconds=i)).strftime("%Y-%m-%d %H:%M:%S")}
+        for i in range(args.trades)
+    ])
+    reminders, reminder_bytes = allocated(lambda: [
+        Reminder(i, "alice", "", due=int(start.timestamp()) + i) for i in range(args.trades)
+    ])
+
+    def reminder_columns():
+        table = ReminderTable(COINS)
+        for i in range(args.trades):
+            table.add("alice", "", due=int(start.timestamp()) + i)
+        return table
+
+    table, table_bytes = allocated(reminder_columns)
+
+    class DictUser:
+        def __init__(self, user_id, username, email, hashed_password, language="en"):
+            self.user_id, self.username, self.email = user_id, username, email
+            self._hashed_password, self.language = hashed_password, language
+
+    _, dict_user_bytes = allocated(lambda: [DictUser(str(i), "alice", "a@b", "x", "en") for i in range(10_000)])
+    _, slot_user_bytes = allocated(lambda: [User(str(i), "alice", "a@b", "x", "en") for i in range(10_000)])
+
+    print(f"{args.trades} trades per user")
+    print(f"  trade dicts                {mb(dict_bytes)}")
+    print(f"  object-column DataFrame    {mb(object_df.memory_usage(deep=True).sum())}")
+    print(f"  typed history columns      {mb(view.nbytes())}")
+    print(f"  typed DataFrame            {mb(typed_df.memory_usage(deep=True).sum())}")
+    print(f"{args.trades} reminders")
+    print(f"  reminder dicts             {mb(reminder_dict_bytes)}")
+    print(f"  slotted reminders          {mb(reminder_bytes)}")
+    print(f"  reminder columns           {mb(table_bytes)}  ({mb(table.nbytes()).strip()} typed)")
+    print("10000 users")
+    print(f"  with __dict__              {mb(dict_user_bytes)}")
+    print(f"  with __slots__             {mb(slot_user_bytes)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,3 @@
+"""
+CryptoWise application modules. app.py is the Streamlit entry point.
+"""
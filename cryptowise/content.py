@@ -0,0 +1,34 @@
+"""
+Educational content.
+"""
+import json
+import os
+
+import streamlit as st
+
+from cryptowise.i18n import LANGUAGES
+
+CONTENT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "content")
+SECTIONS = {"benefits": "Benefits", "risks": "Risks", "solutions": "Solutions"}
+
+
+def read_content(language):
+    """
+    Reads the content of a language from disk. Missing sections are filled
+    in from English.
+    """
+    if language not in LANGUAGES:
+        language = "en"
+    with open(os.path.join(CONTENT_DIR, f"{language}.json"), encoding="utf-8") as f:
+        content = json.load(f)
+    if language != "en":
+        content = {**read_content("en"), **content}
+    return content
+
+
+@st.cache_resource
+def load_content(language):
+    """
+    Loads the content of a language once per process.
+    """
+    return read_content(language)
@@ -0,0 +1,130 @@
+"""
+Chunked dataset exports and the export cache.
+"""
+import collections
+import csv
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import TextIOWrapper
+
+import numpy as np
+import streamlit as st
+
+from cryptowise.ledger import local_utc_offsets
+
+
+EXPORT_CHUNK_ROWS = 50_000
+EXCEL_MAX_ROWS = 1_048_576
+
+def export_rows(file_format, columns, chunks, out):
+    """
+    Writes chunks of row tuples to a binary file as NDJSON, CSV or Excel,
+    one chunk at a time, so memory use does not grow with the row count.
+    """
+    if file_format == "Excel":
+        import openpyxl
+        workbook = openpyxl.Workbook(write_only=True)
+        # A worksheet holds at most EXCEL_MAX_ROWS rows; longer exports go on to the next one
+        room = 0
+        for chunk in chunks:
+            for row in chunk:
+                if not room:
+                    sheet = workbook.create_sheet()
+                    sheet.append(columns)
+                    room = EXCEL_MAX_ROWS - 1
+                sheet.append(row)
+                room -= 1
+        if not workbook.worksheets:
+            workbook.create_sheet().append(columns)
+        workbook.save(out)
+        return
+
+    text = TextIOWrapper(out, encoding="utf-8", newline="")
+    if file_format == "CSV":
+        writer = csv.writer(text)
+        writer.writerow(columns)
+        for chunk in chunks:
+            writer.writerows(chunk)
+    else:
+        for chunk in chunks:
+            text.write("".join(json.dumps(dict(zip(columns, row))) + "\n" for row in chunk))
+    text.flush()
+    text.detach()
+
+def trade_row_chunks(ledger, user, stop=None, chunk_size=EXPORT_CHUNK_ROWS):
+    """
+    Yields a user's trades as chunks of (timestamp, coin, price, amount) rows.
+    """
+    for records in ledger.user_record_chunks(user, chunk_size, stop):
+        local = records["timestamp"] + local_utc_offsets(records["timestamp"])
+        timestamps = local.astype("datetime64[s]").astype(str)
+        yield list(zip(
+            np.char.replace(timestamps, "T", " ").tolist(),
+            np.char.decode(records["coin"], "utf-8").tolist(),
+            records["price"].tolist(),
+            records["amount"].tolist(),
+        ))
+
+class ExportCache:
+    """
+    Process-wide cache of encoded exports keyed by (dataset hash, format).
+    Entries beyond `max_bytes` are evicted least recently used first, and
+    prefetch() renders an export on a background thread ahead of the click.
+    """
+    def __init__(self, max_bytes=256 * 1024 * 1024, workers=2):
+        self.max_bytes = max_bytes
+        self._entries = collections.OrderedDict()
+        self._size = 0
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="export-prerender")
+
+    def get(self, key):
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+            return data
+
+    def _put(self, key, data):
+        with self._lock:
+            if key in self._entries or len(data) > self.max_bytes:
+                return
+            self._entries[key] = data
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def _render(self, key, produce):
+        try:
+            data = produce()
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+        self._put(key, data)
+        return data
+
+    def prefetch(self, key, produce):
+        with self._lock:
+            if key in self._entries or key in self._pending:
+                return
+            self._pending[key] = self._pool.submit(self._render, key, produce)
+
+    def render(self, key, produce):
+        """
+        Returns the cached export, waiting for a pending pre-render or encoding it now.
+        """
+        data = self.get(key)
+        if data is not None:
+            return data
+        with self._lock:
+            pending = self._pending.get(key)
+        if pending is not None:
+            return pending.result()
+        return self._render(key, produce)
+
+@st.cache_resource
+def get_export_cache():
+    return ExportCache()
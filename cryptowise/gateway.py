@@ -0,0 +1,182 @@
+"""
+Trade submission gateway: idempotency keys and rate limits.
+"""
+import collections
+import threading
+import time
+from concurrent.futures import Future
+
+import streamlit as st
+
+from cryptowise.orders import get_matching_engine
+
+
+class RateLimitExceeded(Exception):
+    """
+    Raised when a user, or the whole process, is over its order rate.
+    """
+    def __init__(self, scope, retry_after):
+        super().__init__(f"{scope} order rate exceeded, retry in {retry_after:.1f}s")
+        self.scope = scope
+        self.retry_after = retry_after
+
+
+class TTLCache:
+    """
+    Bounded mapping whose entries expire `ttl` seconds after insertion.
+    Entries are kept in insertion order, which is also expiry order, so
+    expired and surplus entries are always dropped from the front.
+    """
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = collections.OrderedDict()
+
+    def _expire(self, now):
+        while self._entries:
+            key, (expires, _) = next(iter(self._entries.items()))
+            if expires > now and len(self._entries) <= self.maxsize:
+                break
+            del self._entries[key]
+
+    def get(self, key, now=None):
+        now = time.monotonic() if now is None else now
+        self._expire(now)
+        entry = self._entries.get(key)
+        return None if entry is None else entry[1]
+
+    def put(self, key, value, now=None):
+        now = time.monotonic() if now is None else now
+        self._entries.pop(key, None)
+        self._entries[key] = (now + self.ttl, value)
+        self._expire(now)
+
+    def pop(self, key):
+        entry = self._entries.pop(key, None)
+        return None if entry is None else entry[1]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class TokenBucket:
+    """
+    Holds up to `capacity` tokens, refilled at `rate` tokens per second.
+    """
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate, capacity, now):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self, tokens, now):
+        """
+        Takes `tokens` if available and returns 0, or returns the seconds
+        until they will be.
+        """
+        self._refill(now)
+        if self.tokens >= tokens:
+            self.tokens -= tokens
+            return 0.0
+        return (tokens - self.tokens) / self.rate
+
+    def give(self, tokens):
+        self.tokens = min(self.capacity, self.tokens + tokens)
+
+
+class TradeGateway:
+    """
+    Front door for order submission. A submission carrying an idempotency
+    key already seen in the last `key_ttl` seconds gets the original result
+    back, waiting for it if the original is still running. Every new order
+    takes a token from its user's bucket and from the global one. Accepted
+    orders go to the matching engine, whose ledger writer groups concurrent
+    trades into one write.
+    """
+    def __init__(self, engine, user_rate=2.0, user_burst=10, global_rate=500.0, global_burst=1000,
+                 key_ttl=300.0, max_keys=100_000):
+        self.engine = engine
+        self.user_rate = user_rate
+        self.user_burst = user_burst
+        self._global = TokenBucket(global_rate, global_burst, time.monotonic())
+        # An idle bucket is full again after burst / rate seconds, so it can be dropped then
+        self._users = TTLCache(max_keys, user_burst / user_rate)
+        self._results = TTLCache(max_keys, key_ttl)
+        self._lock = threading.Lock()
+
+    def _admit(self, user, tokens):
+        now = time.monotonic()
+        bucket = self._users.get(user, now)
+        if bucket is None:
+            bucket = TokenBucket(self.user_rate, self.user_burst, now)
+        self._users.put(user, bucket, now)
+        wait = bucket.take(tokens, now)
+        if wait:
+            raise RateLimitExceeded("user", wait)
+        wait = self._global.take(tokens, now)
+        if wait:
+            bucket.give(tokens)
+            raise RateLimitExceeded("global", wait)
+
+    def _once(self, user, key, tokens, action):
+        """
+        Runs `action` at most once per (user, key) and returns its result
+        and whether it was a replay.
+        """
+        if key is None:
+            with self._lock:
+                self._admit(user, tokens)
+            return action(), False
+        with self._lock:
+            future = self._results.get((user, key))
+            if future is None:
+                future = Future()
+                self._results.put((user, key), future)
+                try:
+                    self._admit(user, tokens)
+                except RateLimitExceeded:
+                    self._results.pop((user, key))
+                    raise
+                replay = False
+            else:
+                replay = True
+        if replay:
+            return future.result(), True
+        try:
+            result = action()
+        except BaseException as e:
+            # A failed submission may be retried with the same key
+            with self._lock:
+                self._results.pop((user, key))
+            future.set_exception(e)
+            raise
+        future.set_result(result)
+        return result, False
+
+    def submit(self, user, coin, side, quantity, price=None, key=None):
+        """
+        Submits an order through the engine. Returns the order, its trades
+        and whether this was a replay of an earlier submission with `key`.
+        """
+        (order, trades), replay = self._once(
+            user, key, 1, lambda: self.engine.submit(user, coin, side, quantity, price))
+        return order, trades, replay
+
+    def swap(self, user, sell_coin, buy_coin, quantity, key=None):
+        """
+        Swaps one coin for another; counts as two orders.
+        """
+        (sold, bought, trades), replay = self._once(
+            user, key, 2, lambda: self.engine.swap(user, sell_coin, buy_coin, quantity))
+        return sold, bought, trades, replay
+
+
+@st.cache_resource
+def get_trade_gateway():
+    return TradeGateway(get_matching_engine())
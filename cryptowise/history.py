@@ -0,0 +1,95 @@
+"""
+Per-session trade history view.
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from cryptowise.instrumentation import get_instrumentation
+from cryptowise.ledger import HISTORY_COLUMNS, get_ledger, local_utc_offsets
+
+
+class TradeHistoryView:
+    """
+    A user's trade history kept as typed columns: int64 timestamps in local
+    time (epoch seconds shifted by the UTC offset in force at each trade), coins as small integer codes, float64 prices and amounts. New trades are
+    appended in place; the DataFrame and CSV are rebuilt only after a change.
+    """
+    def __init__(self, user, capacity=1024):
+        self.user = user
+        self.version = 0
+        self.coins = []
+        self._coin_codes = {}
+        self._timestamps = np.empty(capacity, dtype=np.int64)
+        self._coin = np.empty(capacity, dtype=np.uint16)
+        self._price = np.empty(capacity, dtype=np.float64)
+        self._amount = np.empty(capacity, dtype=np.float64)
+        self._df = None
+        self._csv = None
+
+    def _grow(self, size):
+        capacity = max(size, 2 * len(self._timestamps))
+        for name in ("_timestamps", "_coin", "_price", "_amount"):
+            column = getattr(self, name)
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self.version] = column[:self.version]
+            setattr(self, name, grown)
+
+    def _append(self, records):
+        start, end = self.version, self.version + len(records)
+        if end > len(self._timestamps):
+            self._grow(end)
+        coins, inverse = np.unique(records["coin"], return_inverse=True)
+        codes = np.array([self._coin_codes.setdefault(c, len(self._coin_codes)) for c in coins], dtype=np.uint16)
+        self.coins.extend(c.decode("utf-8") for c in list(self._coin_codes)[len(self.coins):])
+        self._timestamps[start:end] = records["timestamp"] + local_utc_offsets(records["timestamp"])
+        self._coin[start:end] = codes[inverse]
+        self._price[start:end] = records["price"]
+        self._amount[start:end] = records["amount"]
+
+    def refresh(self, ledger):
+        version = ledger.user_version(self.user)
+        if version != self.version:
+            with get_instrumentation().span("history.append"):
+                self._append(ledger.user_records(self.user, start=self.version, stop=version))
+            self.version = version
+            self._df = None
+            self._csv = None
+        return self.df
+
+    @property
+    def df(self):
+        if self._df is None:
+            with get_instrumentation().span("history.dataframe"):
+                n = self.version
+                self._df = pd.DataFrame({
+                    "timestamp": self._timestamps[:n].astype("datetime64[s]"),
+                    "coin": pd.Categorical.from_codes(self._coin[:n], categories=self.coins),
+                    "price": self._price[:n],
+                    "amount": self._amount[:n],
+                }, columns=HISTORY_COLUMNS)
+        return self._df
+
+    def nbytes(self):
+        """
+        Returns the bytes held by the typed columns.
+        """
+        return sum(getattr(self, name).nbytes for name in ("_timestamps", "_coin", "_price", "_amount"))
+
+    def to_csv(self):
+        """
+        Returns the CSV bytes, encoded once per version.
+        """
+        if self._csv is None:
+            with get_instrumentation().span("history.csv"):
+                self._csv = self.df.to_csv(index=False).encode('utf-8')
+        return self._csv
+
+
+def get_history_view(user):
+    view = st.session_state.get('history_view')
+    if view is None or view.user != user:
+        view = TradeHistoryView(user)
+        st.session_state['history_view'] = view
+    view.refresh(get_ledger())
+    return view
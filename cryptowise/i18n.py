@@ -0,0 +1,38 @@
+"""
+Translation catalogs.
+"""
+import functools
+import json
+import os
+
+
+LOCALES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "locales")
+LANGUAGES = ("en", "ur", "ru")
+
+@functools.lru_cache(maxsize=None)
+def load_catalog(language):
+    """
+    Loads the translation catalog of a language once per process.
+    Missing keys are filled in from English. Kept in a plain LRU cache, not
+    st.cache_resource, whose argument hashing costs more than the lookup.
+    """
+    if language not in LANGUAGES:
+        language = "en"
+    with open(os.path.join(LOCALES_DIR, f"{language}.json"), encoding="utf-8") as f:
+        catalog = json.load(f)
+    if language != "en":
+        catalog = {**load_catalog("en"), **catalog}
+    return catalog
+
+def get_localized_text(language, key):
+    """
+    Retrieves text based on the selected language.
+    """
+    return load_catalog(language).get(key, key)
+
+def get_translator(language):
+    """
+    Returns a lookup function bound to the catalog of a language.
+    """
+    catalog = load_catalog(language)
+    return lambda key: catalog.get(key, key)
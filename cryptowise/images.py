@@ -0,0 +1,165 @@
+"""
+Uploaded-image processing: validation, thumbnails and metadata.
+"""
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import streamlit as st
+
+IMAGE_CACHE_DIR = "image_cache"
+MAX_IMAGE_BYTES = 10 * 1024 * 1024
+MAX_IMAGE_PIXELS = 40_000_000
+IMAGE_FORMATS = ("PNG", "JPEG", "GIF", "WEBP")
+THUMBNAIL_SIZES = (128, 256, 512)
+
+
+def _process(directory, sizes):
+    """
+    Decodes the original in `directory` once, writes a PNG thumbnail per size
+    and the metadata next to it. Runs in a worker process.
+    """
+    from PIL import Image
+
+    Image.MAX_IMAGE_PIXELS = MAX_IMAGE_PIXELS
+    try:
+        with Image.open(os.path.join(directory, "original")) as image:
+            if image.format not in IMAGE_FORMATS:
+                raise ValueError(f"unsupported image format {image.format}")
+            meta = {
+                "format": image.format,
+                "width": image.width,
+                "height": image.height,
+                "mode": image.mode,
+                "frames": getattr(image, "n_frames", 1),
+                "bytes": os.path.getsize(os.path.join(directory, "original")),
+                "thumbnails": [],
+            }
+            image.seek(0)
+            # Converting decodes the whole frame, so truncated or corrupt data fails here
+            frame = image.convert("RGBA" if "A" in image.getbands() or "transparency" in image.info else "RGB")
+    except Image.DecompressionBombError as e:
+        raise ValueError(str(e)) from None
+    except (OSError, SyntaxError, EOFError) as e:
+        raise ValueError(f"not a readable image ({e})") from None
+    for size in sorted(sizes, reverse=True):
+        # Each smaller thumbnail is scaled down from the previous one
+        frame.thumbnail((size, size))
+        frame.save(os.path.join(directory, f"thumb_{size}.png"), optimize=True)
+        meta["thumbnails"].append(size)
+    meta["thumbnails"].sort()
+    with open(os.path.join(directory, "meta.json.tmp"), "w") as f:
+        json.dump(meta, f)
+    os.replace(os.path.join(directory, "meta.json.tmp"), os.path.join(directory, "meta.json"))
+    return meta
+
+
+class ImagePipeline:
+    """
+    Uploaded images are keyed by the SHA-256 of their bytes. The first upload
+    of an image is checked against the size limit, stored on disk and handed
+    to a process pool that decodes it, checks its format and dimensions and
+    writes thumbnails and metadata to the cache directory. Uploading the same
+    bytes again, from any session, reuses the cached result; a rejected image
+    leaves only the reason behind, so it is never decoded again either. A
+    pool whose worker died is replaced on the next upload.
+    """
+    def __init__(self, directory=IMAGE_CACHE_DIR, sizes=THUMBNAIL_SIZES, max_bytes=MAX_IMAGE_BYTES, workers=2):
+        self.directory = directory
+        self.sizes = sizes
+        self.max_bytes = max_bytes
+        self.workers = workers
+        self._pool = self._new_pool()
+        self._pending = {}
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _new_pool(self):
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+
+    def _path(self, digest, name=""):
+        return os.path.join(self.directory, digest, name)
+
+    def submit(self, data):
+        """
+        Queues `data` for processing and returns its digest. Raises ValueError
+        when it is over the size limit.
+        """
+        if len(data) > self.max_bytes:
+            raise ValueError(f"image is larger than {self.max_bytes // (1024 * 1024)} MB")
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            if digest in self._pending or os.path.exists(self._path(digest, "meta.json")) \
+                    or os.path.exists(self._path(digest, "rejected")):
+                return digest
+            os.makedirs(self._path(digest), exist_ok=True)
+            with open(self._path(digest, "original"), "wb") as f:
+                f.write(data)
+            try:
+                future = self._pool.submit(_process, self._path(digest), self.sizes)
+            except BrokenProcessPool:
+                self._pool.shutdown(wait=False)
+                self._pool = self._new_pool()
+                future = self._pool.submit(_process, self._path(digest), self.sizes)
+            self._pending[digest] = future
+        future.add_done_callback(lambda _: self._finish(digest))
+        return digest
+
+    def _finish(self, digest):
+        with self._lock:
+            future = self._pending[digest]
+        error = future.exception()
+        if error is not None:
+            for name in os.listdir(self._path(digest)):
+                os.remove(self._path(digest, name))
+            if isinstance(error, ValueError):
+                # Only the reason is kept, so uploading the same bytes again is refused without decoding
+                with open(self._path(digest, "rejected"), "w") as f:
+                    f.write(str(error))
+            else:
+                # The worker died rather than rejecting the image; a new upload retries it
+                os.rmdir(self._path(digest))
+        # Dropped only once the outcome is on disk, so submit never sees neither
+        with self._lock:
+            del self._pending[digest]
+
+    def metadata(self, digest, timeout=None):
+        """
+        Returns the metadata of a submitted image, waiting for it to be
+        processed. Raises ValueError when the image was rejected.
+        """
+        with self._lock:
+            future = self._pending.get(digest)
+        if future is not None:
+            try:
+                return future.result(timeout)
+            except BrokenProcessPool:
+                raise ValueError("image processing failed, please upload it again") from None
+        try:
+            with open(self._path(digest, "meta.json")) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            pass
+        try:
+            with open(self._path(digest, "rejected")) as f:
+                raise ValueError(f.read())
+        except FileNotFoundError:
+            raise ValueError("image was rejected") from None
+
+    def thumbnail(self, digest, size):
+        """
+        Returns the path of the smallest cached thumbnail of at least `size`
+        pixels, or of the largest one.
+        """
+        sizes = sorted(self.sizes)
+        chosen = next((s for s in sizes if s >= size), sizes[-1])
+        return self._path(digest, f"thumb_{chosen}.png")
+
+
+@st.cache_resource
+def get_image_pipeline():
+    return ImagePipeline()
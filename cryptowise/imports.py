@@ -0,0 +1,166 @@
+"""
+Bulk trade import from CSV and Excel files.
+"""
+import itertools
+import re
+import time
+import warnings
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from cryptowise.instrumentation import get_instrumentation
+from cryptowise.ledger import HISTORY_COLUMNS, TRADE_DTYPE, local_utc_offsets
+
+IMPORT_CHUNK_ROWS = 50_000
+MAX_REPORTED_ERRORS = 1000
+
+_SKIPPED_LINE = re.compile(r"Skipping line (\d+): ([^\n]*)")
+
+
+def read_trade_chunks(source, file_format, chunk_size=IMPORT_CHUNK_ROWS, report=None):
+    """
+    Yields DataFrames of up to `chunk_size` rows from a CSV or Excel file laid
+    out like the trade export (timestamp, coin, price, amount). The index of
+    each frame is the zero-based data row number in the file. CSV lines that
+    cannot be split into the header's fields are skipped and added to
+    `report`; blank lines are kept as empty rows so that numbering holds.
+    """
+    if file_format == "Excel":
+        import openpyxl
+        from openpyxl.utils.exceptions import InvalidFileException
+        try:
+            workbook = openpyxl.load_workbook(source, read_only=True, data_only=True)
+        except (InvalidFileException, zipfile.BadZipFile, KeyError, OSError):
+            raise ValueError("not a readable Excel file") from None
+        # Large exports continue on further sheets, each starting with the same header
+        sheets = [sheet.iter_rows(values_only=True) for sheet in workbook.worksheets]
+        header = [str(name).strip() if name is not None else "" for name in next(sheets[0], ())]
+        rows = itertools.chain(sheets[0], *(itertools.islice(sheet, 1, None) for sheet in sheets[1:]))
+        start = 0
+        for batch in iter(lambda: list(itertools.islice(rows, chunk_size)), []):
+            yield pd.DataFrame(batch, columns=header, index=pd.RangeIndex(start, start + len(batch)))
+            start += len(batch)
+        workbook.close()
+        return
+
+    # Numeric columns are parsed by the C reader; a stray value only turns that chunk's column into text
+    reader = pd.read_csv(source, chunksize=chunk_size, dtype={"timestamp": str, "coin": str},
+                         skipinitialspace=True, skip_blank_lines=False, on_bad_lines="warn")
+    skipped = np.empty(0, dtype=np.int64)
+    while True:
+        # The C reader names each line it skips only in a warning
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always", pd.errors.ParserWarning)
+            chunk = next(reader, None)
+        bad = [match for w in caught if issubclass(w.category, pd.errors.ParserWarning)
+               for match in _SKIPPED_LINE.findall(str(w.message))]
+        if bad:
+            lines = np.array([int(line) for line, _ in bad], dtype=np.int64)
+            skipped = np.sort(np.concatenate((skipped, lines)))
+            if report is not None:
+                report.rows += len(bad)
+                for reason in dict.fromkeys(reason for _, reason in bad):
+                    report.add_errors(lines[[r == reason for _, r in bad]], reason)
+        if chunk is None:
+            return
+        # Rows are numbered by the reader without the skipped lines; count them back in
+        rows = chunk.index.to_numpy()
+        chunk.index = rows + np.searchsorted(skipped - 2 - np.arange(len(skipped)), rows, side="right")
+        chunk.columns = chunk.columns.str.strip()
+        yield chunk
+
+
+class ImportReport:
+    """
+    Outcome of an import: rows read, rows appended, the first
+    MAX_REPORTED_ERRORS rejected rows as (file line, reason) and, when the
+    file could not be read to the end, why.
+    """
+    def __init__(self):
+        self.rows = 0
+        self.imported = 0
+        self.rejected = 0
+        self.errors = []
+        self.failure = None
+
+    def add_errors(self, lines, reason):
+        self.rejected += len(lines)
+        room = MAX_REPORTED_ERRORS - len(self.errors)
+        self.errors.extend((line, reason) for line in lines[:max(room, 0)].tolist())
+
+
+def validate_chunk(chunk, user, symbols, report, now=None):
+    """
+    Checks a whole chunk at once and returns its valid rows as TRADE_DTYPE
+    records for `user`. Rejected rows are added to `report`.
+    Naive timestamps are read as local time, like the exports write them.
+    """
+    missing = [column for column in HISTORY_COLUMNS if column not in chunk.columns]
+    if missing:
+        raise ValueError(f"missing columns: {', '.join(missing)}")
+    now = time.time() if now is None else now
+
+    coin = chunk["coin"].astype(str).str.strip()
+    price = pd.to_numeric(chunk["price"], errors="coerce").to_numpy(dtype=np.float64)
+    amount = pd.to_numeric(chunk["amount"], errors="coerce").to_numpy(dtype=np.float64)
+    stamps = pd.to_datetime(chunk["timestamp"], errors="coerce", format="ISO8601", utc=True)
+    naive = ~chunk["timestamp"].astype(str).str.contains(r"(?:Z|[+-]\d{2}:?\d{2})\s*$").to_numpy()
+    timestamp = stamps.dt.tz_localize(None).to_numpy(dtype="datetime64[s]").astype(np.int64)
+    no_time = stamps.isna().to_numpy()
+    # A local time's offset is the one in force at the UTC instant it names, found in two passes
+    local = naive & ~no_time
+    wall = timestamp[local]
+    timestamp[local] = wall - local_utc_offsets(wall - local_utc_offsets(wall))
+
+    # Each row is reported once, under the first check it fails
+    checks = [
+        (no_time, "unreadable timestamp"),
+        (~no_time & ((timestamp <= 0) | (timestamp > now)), "timestamp out of range"),
+        (~coin.isin(symbols).to_numpy(), "unknown coin"),
+        (~(price > 0) | ~np.isfinite(price), "price must be a positive number"),
+        ((amount == 0) | ~np.isfinite(amount), "amount must be a non-zero number"),
+    ]
+    lines = chunk.index.to_numpy() + 2
+    failed = np.zeros(len(chunk), dtype=bool)
+    for mask, reason in checks:
+        mask = mask & ~failed
+        if mask.any():
+            report.add_errors(lines[mask], reason)
+            failed |= mask
+
+    valid = ~failed
+    records = np.empty(int(valid.sum()), dtype=TRADE_DTYPE)
+    records["user"] = user.encode("utf-8")
+    records["coin"] = coin.to_numpy()[valid].astype("S16")
+    records["amount"] = amount[valid]
+    records["price"] = price[valid]
+    records["timestamp"] = timestamp[valid]
+    return records
+
+
+def import_trades(ledger, user, chunks, symbols, progress=None, report=None):
+    """
+    Validates and appends chunks of trades for `user`, one ledger write per
+    chunk. Invalid rows are reported and skipped; the rest are imported.
+    `progress` is called with the rows read so far after each chunk. An
+    error reading the file stops the import and is kept in `report.failure`;
+    the chunks already appended stay in the ledger.
+    """
+    report = ImportReport() if report is None else report
+    symbols = list(symbols)
+    try:
+        user = ledger._user_key(user)
+        for chunk in chunks:
+            with get_instrumentation().span("import.chunk"):
+                records = validate_chunk(chunk, user, symbols, report)
+                ledger.extend_records(records)
+            report.rows += len(chunk)
+            report.imported += len(records)
+            if progress is not None:
+                progress(report.rows)
+    except ValueError as e:
+        # Includes pandas' ParserError and undecodable text
+        report.failure = str(e).strip()
+    return report
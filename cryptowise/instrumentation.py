@@ -0,0 +1,124 @@
+"""
+Page and span timing with HDR-style latency histograms.
+"""
+import collections
+import contextlib
+import itertools
+import math
+import os
+import threading
+import time
+import tracemalloc
+
+import streamlit as st
+
+
+class LatencyHistogram:
+    """
+    HDR-style histogram: every power of two is split into SUB_BUCKETS linear
+    buckets, so percentiles keep a ~3% relative precision at any magnitude.
+    """
+    SUB_BUCKETS = 32
+
+    def __init__(self, max_exponent=48):
+        self.counts = [0] * (max_exponent * self.SUB_BUCKETS)
+        self.total = 0
+
+    def record(self, value):
+        value = max(int(value), 1)
+        exponent = value.bit_length() - 1
+        sub = ((value - (1 << exponent)) * self.SUB_BUCKETS) >> exponent
+        self.counts[min(exponent * self.SUB_BUCKETS + sub, len(self.counts) - 1)] += 1
+        self.total += 1
+
+    def percentile(self, q):
+        """
+        Returns the upper bound of the bucket holding the q-th percentile.
+        """
+        if not self.total:
+            return 0
+        target = math.ceil(q / 100 * self.total)
+        index = next(i for i, seen in enumerate(itertools.accumulate(self.counts)) if seen >= target)
+        exponent, sub = divmod(index + 1, self.SUB_BUCKETS)
+        return (1 << exponent) + (sub << exponent) // self.SUB_BUCKETS
+
+
+class Instrumentation:
+    """
+    Per-page and per-span measurements. Each span records wall and CPU time
+    in microseconds under its nested name ("Trading/portfolio.refresh");
+    pages also record allocated bytes when trace_memory is set.
+
+    tracemalloc is process-wide: it slows every allocation of every session
+    while it runs, and a page's peak is reset and read across all threads,
+    so alloc_bytes of pages rendered concurrently include each other's
+    allocations. Only enable it when profiling a single session.
+    """
+    METRICS = ("wall_us", "cpu_us", "alloc_bytes")
+
+    def __init__(self, trace_memory=False):
+        self.histograms = collections.defaultdict(lambda: {m: LatencyHistogram() for m in self.METRICS})
+        self.trace_memory = trace_memory
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._last_dump = time.monotonic()
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextlib.contextmanager
+    def span(self, name):
+        stack = self._local.__dict__.setdefault("stack", [])
+        stack.append(name)
+        full_name = "/".join(stack)
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - wall, time.thread_time() - cpu
+            stack.pop()
+            with self._lock:
+                histograms = self.histograms[full_name]
+                histograms["wall_us"].record(wall * 1e6)
+                histograms["cpu_us"].record(cpu * 1e6)
+
+    @contextlib.contextmanager
+    def page(self, name):
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            start = tracemalloc.get_traced_memory()[0]
+        try:
+            with self.span(name):
+                yield
+        finally:
+            if self.trace_memory:
+                allocated = tracemalloc.get_traced_memory()[1] - start
+                with self._lock:
+                    self.histograms[name]["alloc_bytes"].record(allocated)
+
+    def report(self):
+        lines = [f"{'span':<40} {'metric':<12} {'count':>8} {'p50':>10} {'p95':>10} {'p99':>10}"]
+        with self._lock:
+            for name in sorted(self.histograms):
+                for metric, histogram in self.histograms[name].items():
+                    if histogram.total:
+                        lines.append(f"{name:<40} {metric:<12} {histogram.total:>8} "
+                                     + " ".join(f"{histogram.percentile(q):>10}" for q in (50, 95, 99)))
+        return "\n".join(lines)
+
+    def dump(self, path, interval=60):
+        """
+        Writes the report to `path`, at most once per `interval` seconds.
+        """
+        now = time.monotonic()
+        if now - self._last_dump >= interval:
+            self._last_dump = now
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(self.report() + "\n")
+
+METRICS_PATH = "page_metrics.txt"
+# Set to 1 to record allocated bytes per page; see Instrumentation
+TRACE_MEMORY_ENV = "CRYPTOWISE_TRACE_MEMORY"
+
+@st.cache_resource
+def get_instrumentation():
+    return Instrumentation(trace_memory=os.environ.get(TRACE_MEMORY_ENV, "") not in ("", "0"))
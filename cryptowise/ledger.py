@@ -0,0 +1,250 @@
+"""
+Disk-backed, append-only trade ledger.
+"""
+import os
+import struct
+import threading
+import time
+from array import array
+
+import numpy as np
+import streamlit as st
+
+
+TRADE_RECORD = struct.Struct("<32s16sddq")
+TRADE_DTYPE = np.dtype([("user", "S32"), ("coin", "S16"), ("amount", "<f8"), ("price", "<f8"), ("timestamp", "<i8")])
+LEDGER_PATH = "trading_history.ledger"
+MAX_USERNAME_BYTES = TRADE_DTYPE["user"].itemsize
+HISTORY_COLUMNS = ["timestamp", "coin", "price", "amount"]
+# Last second time.localtime() accepts on every platform (9999-12-31)
+_MAX_LOCALTIME = 253402300799
+
+
+def local_utc_offsets(timestamps):
+    """
+    Returns the local UTC offset in seconds at each epoch timestamp, so
+    trades on either side of a daylight saving change get their own offset.
+    Zones change offset on quarter-hour boundaries, so the zone is looked up
+    once per distinct quarter hour rather than once per trade.
+    """
+    quarters, inverse = np.unique(np.clip(timestamps, 0, _MAX_LOCALTIME) // 900, return_inverse=True)
+    offsets = np.array([time.localtime(q * 900).tm_gmtoff for q in quarters.tolist()], dtype=np.int64)
+    return offsets[inverse.reshape(-1)]
+
+
+def _group_rows(keys):
+    """
+    Groups the rows of a 2-D uint64 array by equal rows without sorting the
+    rows themselves: each row is hashed to one integer and the hashes are
+    factorized, then every group is checked against one of its members.
+    Returns a row number per group, all row numbers ordered by group (in
+    their original order within a group) and the bounds of each group in it.
+    """
+    import pandas as pd
+
+    hashed = keys[:, 0].copy()
+    for column in range(1, keys.shape[1]):
+        hashed *= np.uint64(0x9E3779B97F4A7C15)
+        hashed ^= keys[:, column]
+    codes, uniques = pd.factorize(hashed)
+    first = np.empty(len(uniques), dtype=np.int64)
+    first[codes] = np.arange(len(codes))
+    if not all((keys[:, c] == keys[first, c][codes]).all() for c in range(keys.shape[1])):
+        # Two different rows share a hash, so group the rows exactly
+        _, first, codes = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+        codes = codes.ravel()
+    # A stable sort of 16-bit integers is a radix sort
+    order = np.argsort(codes.astype(np.int16 if len(first) < 2 ** 15 else np.int64), kind="stable")
+    bounds = np.concatenate(([0], np.cumsum(np.bincount(codes, minlength=len(first)))))
+    return first, order, bounds
+
+
+class TradeLedger:
+    """
+    Append-only trade ledger stored on disk as fixed-width binary records,
+    with an in-memory index of record offsets per user (int64 arrays).
+    """
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._index = {}
+        self._size = 0
+        open(path, "ab").close()
+        self._load_index()
+
+    def _load_index(self):
+        size = os.path.getsize(self.path)
+        # Ignore a partially written trailing record
+        size -= size % TRADE_RECORD.size
+        if size:
+            words = np.memmap(self.path, dtype=np.uint64, mode="r",
+                              shape=(size // TRADE_RECORD.size, TRADE_RECORD.size // 8))
+            users = words[:, :MAX_USERNAME_BYTES // 8]
+            first, order, bounds = _group_rows(users)
+            offsets = order * TRADE_RECORD.size
+            for i, row in enumerate(first):
+                user = users[row].tobytes().rstrip(b"\0").decode("utf-8", "ignore")
+                self._index[user] = array("q", offsets[bounds[i]:bounds[i + 1]].tobytes())
+        self._size = size
+
+    @staticmethod
+    def _user_key(user):
+        # Usernames are stored in a fixed-width field; cutting them would merge accounts
+        if len(user.encode("utf-8")) > MAX_USERNAME_BYTES:
+            raise ValueError(f"username is longer than {MAX_USERNAME_BYTES} bytes")
+        return user
+
+    def append(self, trade):
+        self.extend([trade])
+
+    def extend(self, trades):
+        """
+        Appends several trades with a single write.
+        """
+        users = [self._user_key(trade["user"]) for trade in trades]
+        records = b"".join(
+            TRADE_RECORD.pack(
+                user.encode("utf-8"),
+                trade["coin"].encode("utf-8")[:16],
+                float(trade["amount"]),
+                float(trade["price"]),
+                int(trade["timestamp"].timestamp()),
+            )
+            for user, trade in zip(users, trades)
+        )
+        with self._lock:
+            with open(self.path, "r+b") as f:
+                f.seek(self._size)
+                f.write(records)
+            offset = self._size
+            # Readers size their memory map from _size, so it grows before any offset is published
+            self._size += len(records)
+            for user in users:
+                self._index.setdefault(user, array("q")).append(offset)
+                offset += TRADE_RECORD.size
+
+    def extend_records(self, records):
+        """
+        Appends a TRADE_DTYPE structured array with a single write. The user
+        index is updated once per distinct user rather than once per record.
+        """
+        records = np.ascontiguousarray(records, dtype=TRADE_DTYPE)
+        if not len(records):
+            return
+        users, inverse = np.unique(records["user"], return_inverse=True)
+        order = np.argsort(inverse, kind="stable")
+        bounds = np.searchsorted(inverse[order], np.arange(len(users) + 1))
+        with self._lock:
+            with open(self.path, "r+b") as f:
+                f.seek(self._size)
+                f.write(records.tobytes())
+            offsets = self._size + np.arange(len(records), dtype=np.int64) * TRADE_RECORD.size
+            self._size += records.nbytes
+            for i, user in enumerate(users):
+                rows = offsets[order[bounds[i]:bounds[i + 1]]]
+                self._index.setdefault(user.decode("utf-8", "ignore"), array("q")).frombytes(rows.tobytes())
+
+    def user_version(self, user):
+        """
+        Returns the number of trades recorded for a user.
+        """
+        return len(self._index.get(self._user_key(user), ()))
+
+    def __len__(self):
+        return self._size // TRADE_RECORD.size
+
+    def records(self, start=0):
+        """
+        Returns all records from record number `start` on as a NumPy structured array.
+        """
+        count = len(self) - start
+        if count <= 0:
+            return np.empty(0, dtype=TRADE_DTYPE)
+        return np.fromfile(self.path, dtype=TRADE_DTYPE, count=count, offset=start * TRADE_RECORD.size)
+
+    def _user_rows(self, user, start, stop):
+        offsets = self._index.get(self._user_key(user), array("q"))[start:stop]
+        return np.frombuffer(offsets, dtype=np.int64) // TRADE_RECORD.size
+
+    def user_records(self, user, start=0, stop=None):
+        """
+        Returns a user's records `start` to `stop` as a NumPy structured array.
+        """
+        rows = self._user_rows(user, start, stop)
+        if not len(rows):
+            return np.empty(0, dtype=TRADE_DTYPE)
+        return np.memmap(self.path, dtype=TRADE_DTYPE, mode="r", shape=(len(self),))[rows]
+
+    def user_record_chunks(self, user, chunk_size, stop=None):
+        """
+        Yields a user's records as NumPy structured arrays of up to `chunk_size` rows.
+        Only the first `stop` records are read when it is given.
+        """
+        rows = self._user_rows(user, 0, stop)
+        if not len(rows):
+            return
+        records = np.memmap(self.path, dtype=TRADE_DTYPE, mode="r", shape=(len(self),))
+        for start in range(0, len(rows), chunk_size):
+            yield records[rows[start:start + chunk_size]]
+
+class _Batch:
+    __slots__ = ("trades", "done", "error")
+
+    def __init__(self):
+        self.trades = []
+        self.done = threading.Event()
+        self.error = None
+
+
+class GroupCommitter:
+    """
+    Group commit in front of a TradeLedger. The first caller of `extend`
+    opens a batch and waits `window` seconds; trades from every caller that
+    arrives meanwhile join it and the batch is written with one
+    `ledger.extend`. Each caller returns once its trades are on disk.
+    """
+    def __init__(self, ledger, window=0.002):
+        self.ledger = ledger
+        self.window = window
+        self.batches = 0
+        self._open = None
+        self._lock = threading.Lock()
+
+    def extend(self, trades):
+        # Checked here so one caller's bad trade cannot fail everyone's batch
+        for trade in trades:
+            self.ledger._user_key(trade["user"])
+        with self._lock:
+            batch = self._open
+            leader = batch is None
+            if leader:
+                batch = self._open = _Batch()
+            batch.trades.extend(trades)
+        if leader:
+            time.sleep(self.window)
+            with self._lock:
+                self._open = None
+            try:
+                self.ledger.extend(batch.trades)
+                self.batches += 1
+            except Exception as e:
+                batch.error = e
+            finally:
+                batch.done.set()
+        else:
+            batch.done.wait()
+        if batch.error is not None:
+            raise batch.error
+
+    def append(self, trade):
+        self.extend([trade])
+
+
+@st.cache_resource
+def get_ledger():
+    return TradeLedger(LEDGER_PATH)
+
+
+@st.cache_resource
+def get_ledger_writer():
+    return GroupCommitter(get_ledger())
@@ -0,0 +1,301 @@
+"""
+Simulated market: GBM price ticks and OHLCV candle aggregation.
+"""
+import threading
+import time
+import weakref
+
+import numpy as np
+import streamlit as st
+
+
+class CandleSeries:
+    """
+    OHLCV bars of one resolution. The current bar is updated in place and
+    finished bars are kept in fixed-size columnar ring buffers.
+    """
+    OPEN, HIGH, LOW, CLOSE, VOLUME = range(5)
+
+    def __init__(self, seconds, n_symbols, max_bars):
+        self.seconds = seconds
+        self.start = None
+        self.current = np.zeros((5, n_symbols))
+        self.times = np.zeros(max_bars, dtype=np.int64)
+        self.bars = np.zeros((max_bars, 5, n_symbols))
+        self._head = -1
+        self.count = 0
+
+    def update(self, timestamp, prices):
+        bucket = int(timestamp // self.seconds) * self.seconds
+        if bucket != self.start:
+            if self.start is not None:
+                self._finish(self.start, self.current)
+            self.start = bucket
+            self.current[:4] = prices
+            self.current[self.VOLUME] = 0
+        else:
+            np.maximum(self.current[self.HIGH], prices, out=self.current[self.HIGH])
+            np.minimum(self.current[self.LOW], prices, out=self.current[self.LOW])
+            self.current[self.CLOSE] = prices
+
+    def _finish(self, start, bar):
+        self._head = (self._head + 1) % len(self.times)
+        self.times[self._head] = start
+        self.bars[self._head] = bar
+        self.count = min(self.count + 1, len(self.times))
+
+    def backfill(self, times, closes):
+        """
+        Stores finished bars from a series of closing prices.
+        """
+        bar = np.zeros_like(self.current)
+        for start, close in zip(times, closes):
+            bar[:4] = close
+            self._finish(start, bar)
+
+    def close_ago(self, i, bars_ago):
+        if bars_ago == 0 and self.start is not None:
+            return float(self.current[self.CLOSE, i])
+        bars_ago -= self.start is not None
+        if bars_ago >= self.count:
+            return None
+        return float(self.bars[(self._head - bars_ago) % len(self.times), self.CLOSE, i])
+
+    def frame(self, i):
+        """
+        Returns the bars of one symbol in time order, current bar included.
+        """
+        import pandas as pd
+
+        rows = (self._head - np.arange(self.count)[::-1]) % len(self.times)
+        times, bars = self.times[rows], self.bars[rows, :, i]
+        if self.start is not None:
+            times = np.append(times, self.start)
+            bars = np.vstack([bars, self.current[:, i]])
+        return pd.DataFrame(bars, columns=["open", "high", "low", "close", "volume"],
+                            index=pd.to_datetime(times, unit="s"))
+
+
+class CandleAggregator:
+    """
+    Rolls price ticks into OHLCV bars at several resolutions in a single pass.
+    """
+    RESOLUTIONS = {"1s": (1, 3600), "1m": (60, 1440), "1h": (3600, 720), "1d": (86400, 400)}
+
+    def __init__(self, n_symbols):
+        self.series = {name: CandleSeries(seconds, n_symbols, max_bars)
+                       for name, (seconds, max_bars) in self.RESOLUTIONS.items()}
+
+    def update(self, timestamp, prices):
+        for series in self.series.values():
+            series.update(timestamp, prices)
+
+    def add_volume(self, i, amount):
+        for series in self.series.values():
+            if series.start is not None:
+                series.current[CandleSeries.VOLUME, i] += amount
+
+
+class CryptoMarket:
+    """
+    Simulated market. Prices follow correlated geometric Brownian motion and
+    the recent ticks of every coin are kept in a fixed-size ring buffer.
+    Drift and volatility are annualized; every tick is rolled into candles.
+    """
+    DEFAULT_PRICES = {
+        'Bitcoin': 64000,
+        'Ethereum': 3100,
+        'Solana': 150,
+        'Ripple': 0.65
+    }
+    SECONDS_PER_YEAR = 365 * 86400
+
+    def __init__(self, prices=None, drift=0.05, volatility=0.5, correlation=0.5,
+                 history=600, tick_interval=1.0, seed=None):
+        start = prices or self.DEFAULT_PRICES
+        self.symbols = list(start)
+        self._index = {coin: i for i, coin in enumerate(self.symbols)}
+        n = len(self.symbols)
+        self._mu = np.broadcast_to(np.asarray(drift, dtype=float), (n,))
+        self._sigma = np.broadcast_to(np.asarray(volatility, dtype=float), (n,))
+        self._correlation = correlation
+        self._rng = np.random.default_rng(seed)
+        self._lock = threading.Lock()
+        self.tick_interval = tick_interval
+        self.candles = CandleAggregator(n)
+
+        now = time.time()
+        self._last_tick = now
+        self._ticks = np.empty((history, n))
+        self._ticks[:] = np.asarray(list(start.values()), dtype=float)
+        self._head = 0
+        self._count = 1
+        self._listeners = []
+
+        # Simulate a year of daily closes ending at the starting prices
+        path = np.exp(np.cumsum(self._log_returns(366, 1 / 365), axis=0))
+        path *= self._ticks[0] / path[-1]
+        today = int(now // 86400) * 86400
+        self.candles.series["1d"].backfill(today - 86400 * np.arange(365, 0, -1), path[:-1])
+        self.candles.update(now, self._ticks[0])
+
+    def _log_returns(self, steps, dt):
+        # One-factor model: every coin shares a common shock weighted by the correlation
+        n = len(self.symbols)
+        common = self._rng.standard_normal((steps, 1))
+        own = self._rng.standard_normal((steps, n))
+        z = np.sqrt(self._correlation) * common + np.sqrt(1 - self._correlation) * own
+        return (self._mu - 0.5 * self._sigma ** 2) * dt + self._sigma * np.sqrt(dt) * z
+
+    def tick(self, steps=1, now=None):
+        """
+        Advances every coin by `steps` ticks at once, the last one stamped `now`.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            self._tick(steps, now)
+
+    def _tick(self, steps, now):
+        dt = self.tick_interval / self.SECONDS_PER_YEAR
+        path = self._ticks[self._head] * np.exp(np.cumsum(self._log_returns(steps, dt), axis=0))
+        times = now - self.tick_interval * np.arange(steps)[::-1]
+        for timestamp, prices in zip(times, path):
+            self.candles.update(timestamp, prices)
+        size = len(self._ticks)
+        rows = (self._head + 1 + np.arange(steps)) % size
+        self._ticks[rows[-size:]] = path[-size:]
+        self._head = int(rows[-1])
+        self._count += steps
+        self._last_tick = now
+        for listener in self._listeners:
+            listener(times, path)
+
+    def add_tick_listener(self, listener):
+        """
+        Calls `listener(times, prices)` with every batch of ticks from now on,
+        under the market lock. Returns the ticks already in the ring buffer,
+        oldest first, so the listener can start from them without a gap.
+        """
+        with self._lock:
+            self._listeners.append(listener)
+            size = len(self._ticks)
+            rows = (self._head - np.arange(min(self._count, size))[::-1]) % size
+            return self._ticks[rows].copy()
+
+    def advance(self):
+        """
+        Runs the ticks that are due since the last call, one per tick_interval seconds.
+        """
+        with self._lock:
+            steps = int((time.time() - self._last_tick) // self.tick_interval)
+            if steps > 0:
+                self._tick(min(steps, len(self._ticks)), self._last_tick + steps * self.tick_interval)
+
+    @property
+    def prices(self):
+        return dict(zip(self.symbols, self._ticks[self._head].tolist()))
+
+    def get_price(self, coin, ticks_ago=0):
+        i = self._index.get(coin)
+        if i is None or ticks_ago >= len(self._ticks):
+            return 'N/A'
+        return float(self._ticks[(self._head - ticks_ago) % len(self._ticks), i])
+
+    def get_close(self, coin, resolution, bars_ago):
+        """
+        Returns the closing price `bars_ago` bars back at a candle resolution.
+        """
+        i = self._index.get(coin)
+        close = None if i is None else self.candles.series[resolution].close_ago(i, bars_ago)
+        return 'N/A' if close is None else close
+
+    def latest(self):
+        """
+        Returns the latest price of every coin, in `symbols` order.
+        """
+        return self._ticks[self._head].copy()
+
+    def get_candles(self, coin, resolution):
+        return self.candles.series[resolution].frame(self._index[coin])
+
+    def record_volume(self, coin, amount):
+        i = self._index.get(coin)
+        if i is not None:
+            with self._lock:
+                self.candles.add_volume(i, amount)
+
+
+class Subscription:
+    """
+    One session's view of a coin. The hub overwrites `price` and bumps
+    `version` whenever the coin moves.
+    """
+    __slots__ = ("coin", "price", "version", "__weakref__")
+
+    def __init__(self, coin, price):
+        self.coin = coin
+        self.price = price
+        self.version = 0
+
+
+class MarketHub:
+    """
+    Process-wide price feed. A publisher thread advances the shared market
+    once per tick and pushes the new price of every coin that moved to that
+    coin's subscribers only. Subscribers are held weakly, so a subscription
+    goes away with the session that owns it.
+    """
+    def __init__(self, market):
+        self.market = market
+        self._subscribers = {}
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="market-hub", daemon=True)
+        self._thread.start()
+
+    def subscribe(self, coin):
+        subscription = Subscription(coin, self.market.get_price(coin))
+        with self._lock:
+            self._subscribers.setdefault(coin, weakref.WeakSet()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.coin)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+
+    def publish(self, prices, last):
+        """
+        Pushes every changed price in `prices` (in `market.symbols` order) to
+        the subscribers of that coin.
+        """
+        with self._lock:
+            for coin, subscribers in list(self._subscribers.items()):
+                if not subscribers:
+                    del self._subscribers[coin]
+                    continue
+                i = self.market._index[coin]
+                if prices[i] != last[i]:
+                    price = float(prices[i])
+                    for subscription in subscribers:
+                        subscription.price = price
+                        subscription.version += 1
+
+    def _run(self):
+        last = self.market.latest()
+        while True:
+            time.sleep(self.market.tick_interval)
+            self.market.advance()
+            prices = self.market.latest()
+            self.publish(prices, last)
+            last = prices
+
+
+@st.cache_resource
+def get_market():
+    return CryptoMarket()
+
+
+@st.cache_resource
+def get_market_hub():
+    return MarketHub(get_market())
@@ -0,0 +1,154 @@
+"""
+Limit order books and the matching engine.
+"""
+import collections
+import heapq
+import itertools
+import threading
+from datetime import datetime
+
+import streamlit as st
+
+from cryptowise.ledger import get_ledger_writer
+from cryptowise.market import get_market
+
+
+class OrderBook:
+    """
+    Limit order book for one coin with price-time priority. Each price level
+    is a FIFO queue and the best levels are found through a heap per side.
+    Cancelled orders are dropped lazily when they reach the front of a level.
+    """
+    def __init__(self, coin):
+        self.coin = coin
+        self._levels = {"buy": {}, "sell": {}}
+        self._heaps = {"buy": [], "sell": []}  # buy prices are stored negated
+        self.orders = {}
+
+    def _best(self, side):
+        heap, levels = self._heaps[side], self._levels[side]
+        while heap:
+            price = -heap[0] if side == "buy" else heap[0]
+            level = levels[price]
+            while level and level[0]["remaining"] <= 0:
+                level.popleft()
+            if level:
+                return price
+            del levels[price]
+            heapq.heappop(heap)
+        return None
+
+    def best_bid(self):
+        return self._best("buy")
+
+    def best_ask(self):
+        return self._best("sell")
+
+    def submit(self, order):
+        """
+        Matches an order against the opposite side and rests what is left of a
+        limit order. Returns the fills as (resting order, quantity, price).
+        """
+        side, limit = order["side"], order["price"]
+        opposite = "sell" if side == "buy" else "buy"
+        fills = []
+        while order["remaining"] > 0:
+            best = self._best(opposite)
+            if best is None or (limit is not None and (best > limit if side == "buy" else best < limit)):
+                break
+            resting = self._levels[opposite][best][0]
+            quantity = min(order["remaining"], resting["remaining"])
+            resting["remaining"] -= quantity
+            order["remaining"] -= quantity
+            if resting["remaining"] <= 0:
+                del self.orders[resting["id"]]
+            fills.append((resting, quantity, best))
+
+        if order["remaining"] > 0 and limit is not None:
+            level = self._levels[side].get(limit)
+            if level is None:
+                level = self._levels[side][limit] = collections.deque()
+                heapq.heappush(self._heaps[side], -limit if side == "buy" else limit)
+            level.append(order)
+            self.orders[order["id"]] = order
+        return fills
+
+    def cancel(self, order_id):
+        order = self.orders.pop(order_id, None)
+        if order is None:
+            return False
+        order["remaining"] = 0
+        return True
+
+    def depth(self, side, levels=5):
+        """
+        Returns up to `levels` best (price, quantity) pairs of one side.
+        """
+        book = self._levels[side]
+        prices = heapq.nsmallest(levels, self._heaps[side])
+        return [(p, sum(o["remaining"] for o in book[p]))
+                for p in ((-p if side == "buy" else p) for p in prices)
+                if p in book and any(o["remaining"] > 0 for o in book[p])]
+
+
+class MatchingEngine:
+    """
+    One order book per coin. Fills are recorded in the trade ledger for
+    both sides; the part of a market order the book cannot fill is filled
+    by the simulated market at its current price.
+    """
+    def __init__(self, market, ledger=None):
+        self.market = market
+        self.ledger = ledger
+        self.books = {coin: OrderBook(coin) for coin in market.symbols}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def submit(self, user, coin, side, quantity, price=None):
+        """
+        Submits a limit order, or a market order when `price` is None.
+        Returns the order and the list of trades it produced.
+        """
+        order = {"id": next(self._ids), "user": user, "coin": coin, "side": side,
+                 "price": price, "quantity": quantity, "remaining": quantity, "value": 0.0}
+        now = datetime.now()
+        sign = 1 if side == "buy" else -1
+        trades = []
+        with self._lock:
+            for resting, filled, fill_price in self.books[coin].submit(order):
+                trades.append({"user": user, "coin": coin, "amount": sign * filled * fill_price,
+                               "price": fill_price, "timestamp": now})
+                trades.append({"user": resting["user"], "coin": coin, "amount": -sign * filled * fill_price,
+                               "price": fill_price, "timestamp": now})
+                order["value"] += filled * fill_price
+            if price is None and order["remaining"] > 0:
+                fill_price = self.market.get_price(coin)
+                trades.append({"user": user, "coin": coin, "amount": sign * order["remaining"] * fill_price,
+                               "price": fill_price, "timestamp": now})
+                order["value"] += order["remaining"] * fill_price
+                order["remaining"] = 0
+        # Written outside the lock so that concurrent orders can share a ledger write
+        if self.ledger is not None and trades:
+            self.ledger.extend(trades)
+        return order, trades
+
+    def swap(self, user, sell_coin, buy_coin, quantity):
+        """
+        Sells `quantity` of one coin at market and buys another with the
+        proceeds. Returns both orders and all the trades they produced.
+        """
+        sold, trades = self.submit(user, sell_coin, "sell", quantity)
+        bought, buy_trades = self.submit(user, buy_coin, "buy", sold["value"] / self.market.get_price(buy_coin))
+        return sold, bought, trades + buy_trades
+
+    def cancel(self, coin, order_id):
+        with self._lock:
+            return self.books[coin].cancel(order_id)
+
+    def open_orders(self, user, coin):
+        with self._lock:
+            return [o for o in self.books[coin].orders.values() if o["user"] == user]
+
+@st.cache_resource
+def get_matching_engine():
+    return MatchingEngine(get_market(), get_ledger_writer())
@@ -0,0 +1,3 @@
+"""
+Page handlers, imported lazily by the dispatch table in app.py.
+"""
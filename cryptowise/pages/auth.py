@@ -0,0 +1,66 @@
+import uuid
+
+import streamlit as st
+
+from cryptowise.i18n import get_localized_text, get_translator
+from cryptowise.ledger import MAX_USERNAME_BYTES
+from cryptowise.users import User, get_user_repository, hash_password
+
+
+def register():
+    text = get_translator(st.session_state['language'])
+    st.subheader(text("register_title"))
+    username = st.text_input(text("username_label"), key="reg_username")
+    email = st.text_input(text("email_label"), key="reg_email")
+    password = st.text_input(text("password_label"), type="password", key="reg_password")
+
+    if st.button(text("register_button")):
+        if not username:
+            st.error(text("required_field"))
+            return
+        if len(username.encode("utf-8")) > MAX_USERNAME_BYTES:
+            st.error(text("username_too_long"))
+            return
+        if not email:
+            st.error(text("required_field"))
+            return
+        if not password:
+            st.error(text("required_field"))
+            return
+        users = get_user_repository()
+        if users.exists(username):
+            st.error(text("username_exists"))
+        else:
+            user_id = str(uuid.uuid4())
+            hashed_password = hash_password(password)
+            language = st.session_state['language']
+            if users.add(User(user_id, username, email, hashed_password, language)):
+                st.success("Registered successfully. You can now login.")
+            else:
+                st.error(text("username_exists"))
+
+def login():
+    text = get_translator(st.session_state['language'])
+    st.subheader(text("login_title"))
+    username = st.text_input(text("username_label"), key="login_username")
+    password = st.text_input(text("password_label"), type="password", key="login_password")
+
+    if st.button(text("login_button")):
+        if not username:
+            st.error(text("required_field"))
+            return
+        if not password:
+            st.error(text("required_field"))
+            return
+
+        user = get_user_repository().get(username)
+        if user and user.check_password(password):
+            st.session_state['logged_in_user'] = username
+            st.session_state['language'] = user.language
+            st.success(f"Welcome back, {username}!")
+        else:
+            st.error(text("invalid_credentials"))
+
+def logout():
+    st.session_state['logged_in_user'] = None
+    st.success(get_localized_text(st.session_state['language'], "logout_message"))
@@ -0,0 +1,43 @@
+import streamlit as st
+
+from cryptowise.content import load_content
+from cryptowise.history import get_history_view
+from cryptowise.i18n import get_localized_text
+
+
+#  crypto_details
+def crypto_details():
+    st.subheader("📈 Crypto Trading History")
+
+    if not st.session_state['logged_in_user']:
+        st.warning("Please login to view your trading history.")
+        return
+
+    history = get_history_view(st.session_state['logged_in_user'])
+
+    if history.version:
+        st.dataframe(history.df, use_container_width=True)
+
+        st.download_button(label=get_localized_text(st.session_state['language'], "download_data"),
+                           data=history.to_csv(),
+                           file_name='trading_history.csv',
+                           mime='text/csv')
+    else:
+        st.info("No trading history available.")
+
+    content = load_content(st.session_state['language'])
+
+    st.title("Click to Explore Cryptocurrencies")
+
+    for name, details in content["coins"].items():
+        with st.expander(f"🔹 {name}"):
+            for key, value in details.items():
+                st.subheader(key)
+                if isinstance(value, list):
+                    for item in value:
+                        st.markdown(f"- {item}")
+                else:
+                    st.markdown(value)
+
+    st.subheader("🔚 Summary Table:")
+    st.markdown(content["summary"])
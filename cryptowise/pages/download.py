@@ -0,0 +1,93 @@
+import hashlib
+import json
+import tempfile
+from io import BufferedRandom
+
+import streamlit as st
+
+from cryptowise.exports import export_rows, get_export_cache, trade_row_chunks
+from cryptowise.i18n import get_localized_text
+from cryptowise.instrumentation import get_instrumentation
+from cryptowise.ledger import HISTORY_COLUMNS, get_ledger
+
+
+class DataDownloader:
+    FORMATS = {
+        "JSON": ("data.ndjson", "application/x-ndjson"),
+        "CSV": ("data.csv", "text/csv"),
+        "Excel": ("data.xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    }
+
+    PRERENDER_FORMATS = ("CSV", "JSON")
+
+    def __init__(self, columns=None, chunks=None, fingerprint=None):
+        """
+        `chunks` is a callable returning an iterator of row chunks and
+        `fingerprint` a string that changes whenever the rows do; without
+        them the downloader serves a small sample dataset.
+        """
+        if chunks is None:
+            columns = ["Name", "Age", "City"]
+            sample = [
+                ("Alice", 25, "New York"),
+                ("Bob", 30, "London"),
+                ("Charlie", 35, "Tokyo"),
+                ("Anum", 22, "Pakistan"),
+                ("Noor", 24, "India"),
+            ]
+            chunks = lambda: iter([sample])
+            fingerprint = json.dumps(sample)
+        self.columns = columns
+        self.chunks = chunks
+        self.content_hash = hashlib.sha256(f"{columns}:{fingerprint}".encode()).hexdigest()
+        self.cache = get_export_cache()
+
+    @classmethod
+    def for_user(cls, ledger, user):
+        # The ledger is append-only, so a user's trade count identifies their rows
+        version = ledger.user_version(user)
+        return cls(HISTORY_COLUMNS, lambda: trade_row_chunks(ledger, user, stop=version),
+                   fingerprint=f"trades:{user}:{version}")
+
+    def download_data_ui(self, get_localized_text, language):
+        st.subheader(get_localized_text(language, "download_data"))
+        file_format = st.selectbox("Select format", list(self.FORMATS))
+
+        for prerender_format in (file_format, *self.PRERENDER_FORMATS):
+            self.cache.prefetch((self.content_hash, prerender_format), lambda f=prerender_format: self._encode(f))
+        self._download(file_format)
+
+    def export(self, file_format):
+        """
+        Encodes the dataset into a temporary file and returns it rewound.
+        """
+        raw = tempfile.TemporaryFile(buffering=0)
+        out = BufferedRandom(raw)
+        export_rows(file_format, self.columns, self.chunks(), out)
+        out.flush()
+        out.detach()
+        raw.seek(0)
+        return raw
+
+    def _encode(self, file_format):
+        with get_instrumentation().span(f"export.{file_format}"), self.export(file_format) as f:
+            return f.read()
+
+    def _download(self, file_format):
+        file_name, mime = self.FORMATS[file_format]
+        key = (self.content_hash, file_format)
+        data = self.cache.get(key)
+        st.download_button(
+            label=f"Download {file_format}",
+            data=data if data is not None else lambda: self.cache.render(key, lambda: self._encode(file_format)),
+            file_name=file_name,
+            mime=mime
+        )
+
+
+def download():
+    if st.session_state['logged_in_user']:
+        downloader = DataDownloader.for_user(get_ledger(), st.session_state['logged_in_user'])
+    else:
+        downloader = DataDownloader()
+    downloader.download_data_ui(get_localized_text, st.session_state['language'])
@@ -0,0 +1,18 @@
+import streamlit as st
+
+from cryptowise.content import load_content
+from cryptowise.i18n import get_localized_text
+
+
+def show_section(section):
+    language = st.session_state['language']
+    st.subheader(get_localized_text(language, f"{section}_title"))
+    st.markdown("\n".join(f"- {item}" for item in load_content(language)[section]))
+
+
+def benefits():
+    show_section("benefits")
+
+# solutions
+def solutions():
+    show_section("solutions")
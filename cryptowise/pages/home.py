@@ -0,0 +1,9 @@
+import streamlit as st
+
+from cryptowise.i18n import get_localized_text
+
+
+def home():
+    st.image("https://www.shutterstock.com/image-photo/technical-price-graph-indicator-red-600nw-2159962175.jpg", width=100)
+    st.markdown(get_localized_text(st.session_state['language'], "home_title"))
+    st.markdown(get_localized_text(st.session_state['language'], "home_text"))
@@ -0,0 +1,41 @@
+import streamlit as st
+
+from cryptowise.i18n import get_translator
+from cryptowise.images import IMAGE_FORMATS, get_image_pipeline
+
+
+def show_image_details(digest):
+    """
+    Displays the thumbnail and metadata of the uploaded image.
+    """
+    text = get_translator(st.session_state['language'])
+    if not digest:
+        st.write(text("no_image_uploaded"))
+        return
+    pipeline = get_image_pipeline()
+    try:
+        with st.spinner():
+            meta = pipeline.metadata(digest)
+    except ValueError as e:
+        st.error(f"{text('error_image_upload')} {e}")
+        st.session_state['uploaded_image'] = None
+        return
+    st.subheader(text("image_details_title"))
+    st.image(pipeline.thumbnail(digest, 512), caption="Uploaded Image")
+    st.write(f"Format: {meta['format']}, {meta['width']} x {meta['height']} px, {meta['mode']}")
+    if meta['frames'] > 1:
+        st.write(f"Frames: {meta['frames']}")
+    st.write(f"Image Size: {meta['bytes']} bytes")
+
+
+def upload_image():
+    text = get_translator(st.session_state['language'])
+    st.subheader(text("upload_image_title"))
+    uploaded = st.file_uploader(text("upload_image_title"), type=[f.lower() for f in IMAGE_FORMATS] + ["jpg"],
+                                label_visibility="collapsed")
+    if uploaded is not None:
+        try:
+            st.session_state['uploaded_image'] = get_image_pipeline().submit(uploaded.getvalue())
+        except ValueError as e:
+            st.error(f"{text('error_image_upload')} {e}")
+    show_image_details(st.session_state['uploaded_image'])
@@ -0,0 +1,41 @@
+import pandas as pd
+import streamlit as st
+
+from cryptowise.imports import ImportReport, import_trades, read_trade_chunks
+from cryptowise.ledger import HISTORY_COLUMNS, get_ledger
+from cryptowise.market import get_market
+
+
+def trade_import():
+    st.subheader("📥 Import Trades")
+
+    if not st.session_state['logged_in_user']:
+        st.warning("Please login to import trades.")
+        return
+
+    st.caption(f"CSV or Excel file with the columns {', '.join(HISTORY_COLUMNS)}, as written by Download. "
+               "Sells have a negative amount; timestamps without a UTC offset are read as local time.")
+    uploaded = st.file_uploader("Trade file", type=["csv", "xlsx"])
+    if uploaded is None or not st.button("Import"):
+        return
+
+    file_format = "Excel" if uploaded.name.lower().endswith(".xlsx") else "CSV"
+    status = st.empty()
+    report = ImportReport()
+    import_trades(
+        get_ledger(), st.session_state['logged_in_user'],
+        read_trade_chunks(uploaded, file_format, report=report), get_market().symbols,
+        progress=lambda rows: status.text(f"{rows:,} rows read..."), report=report,
+    )
+
+    summary = f"Imported {report.imported:,} of {report.rows:,} trades."
+    if report.failure:
+        status.error(f"Import stopped: {report.failure}. {summary}")
+    else:
+        status.success(summary)
+    if report.rejected:
+        st.warning(f"{report.rejected:,} rows were skipped.")
+        errors = pd.DataFrame(report.errors, columns=["line", "reason"])
+        if len(report.errors) < report.rejected:
+            st.caption(f"Showing the first {len(report.errors):,}.")
+        st.dataframe(errors, hide_index=True)
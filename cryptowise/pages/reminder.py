@@ -0,0 +1,60 @@
+from datetime import datetime
+
+import streamlit as st
+
+from cryptowise.market import get_market
+from cryptowise.reminders import get_scheduler
+
+
+class ReminderApp:
+    def __init__(self):
+        self.scheduler = get_scheduler()
+
+    def set_reminder(self):
+        st.subheader("⏰ Set Reminder")
+
+        if not st.session_state['logged_in_user']:
+            st.warning("Please login to set a reminder.")
+            return
+
+        reminder_msg = st.text_input("Reminder Message")
+        reminder_kind = st.radio("Remind me", ["At a time", "When a price is crossed"], horizontal=True)
+
+        if reminder_kind == "At a time":
+            reminder_time = st.time_input("Reminder Time (Today)")
+
+            now = datetime.now()
+            reminder_datetime = datetime.combine(now.date(), reminder_time)
+
+            if st.button("Set Reminder"):
+                if reminder_datetime <= now:
+                    st.error("Reminder time must be in the future.")
+                else:
+                    st.success(f"Reminder set for {reminder_time.strftime('%H:%M:%S')}")
+                    self.scheduler.add_time_reminder(st.session_state['logged_in_user'], reminder_msg, reminder_datetime)
+        else:
+            market = get_market()
+            coin = st.selectbox("Coin", market.symbols)
+            # A stable key keeps the user's price across ticks; it starts at the market price
+            threshold_key = f"reminder_threshold_{coin}"
+            if threshold_key not in st.session_state:
+                st.session_state[threshold_key] = round(market.get_price(coin), 4)
+            threshold = st.number_input("Price (USD)", min_value=0.0, format="%.4f", key=threshold_key)
+
+            if st.button("Set Reminder"):
+                st.success(f"Reminder set for {coin} crossing ${threshold:,.4f}")
+                self.scheduler.add_price_alert(st.session_state['logged_in_user'], reminder_msg, coin, threshold)
+
+    def display_reminders(self):
+        st.subheader("📋 Your Reminders")
+        for reminder in self.scheduler.pending(st.session_state['logged_in_user']):
+            if reminder.coin is not None:
+                st.write(f"📈 {reminder.coin} crosses ${reminder.threshold:,.4f} - {reminder.message}")
+            else:
+                st.write(f"🕒 {reminder.time} - {reminder.message}")
+
+
+def reminder():
+    app = ReminderApp()
+    app.set_reminder()
+    app.display_reminders()
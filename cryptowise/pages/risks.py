@@ -0,0 +1,41 @@
+import pandas as pd
+import streamlit as st
+
+from cryptowise.ledger import get_ledger
+from cryptowise.market import get_market
+from cryptowise.pages.education import show_section
+from cryptowise.portfolio import get_portfolio
+from cryptowise.risk import get_risk_engine
+
+
+def risks():
+    show_section("risks")
+    market = get_market()
+    market.advance()
+    engine = get_risk_engine()
+    if engine.samples < 2:
+        st.info("Collecting price ticks; risk statistics appear after a few seconds.")
+        return
+    st.caption(f"Over the last {engine.samples} ticks; value at risk is the one-day "
+               f"{engine.confidence:.0%} loss, drawdown runs since the server started.")
+    stats = pd.DataFrame([engine.coin_risk(coin) for coin in market.symbols], index=market.symbols)
+    stats.columns = ["Volatility (annual)", "VaR parametric", "VaR historical", "Max drawdown"]
+    st.dataframe(stats.style.format("{:.2%}"))
+    st.caption("Correlation of returns")
+    st.dataframe(pd.DataFrame(engine.correlation(), index=market.symbols, columns=market.symbols).round(2))
+
+    user = st.session_state['logged_in_user']
+    if not user:
+        return
+    portfolio = get_portfolio()
+    portfolio.refresh(get_ledger())
+    holdings = portfolio.valuation(user)
+    holdings = holdings[holdings["quantity"] != 0]
+    if holdings.empty:
+        return
+    coins = holdings.index.get_level_values("coin").tolist()
+    risk = engine.portfolio_risk(user, coins, holdings["value"].to_numpy())
+    st.caption("Your portfolio")
+    col_parametric, col_historical = st.columns(2)
+    col_parametric.metric("VaR parametric (USD)", f"${risk['var_parametric']:,.2f}")
+    col_historical.metric("VaR historical (USD)", f"${risk['var_historical']:,.2f}")
@@ -0,0 +1,18 @@
+import time
+
+import streamlit as st
+
+from cryptowise.search import search
+
+
+def search_content():
+    st.subheader("🔎 Search")
+    query = st.text_input("Search the learning material", key="search_query")
+    if not query.strip():
+        return
+    start = time.perf_counter()
+    results = search(query, st.session_state['language'])
+    elapsed = time.perf_counter() - start
+    st.caption(f"{len(results)} results in {elapsed * 1000:.2f} ms")
+    for _, doc in results:
+        st.markdown(f"**{doc['title']}** · _{doc['page']}_\n\n{doc['text']}")
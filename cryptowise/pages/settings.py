@@ -0,0 +1,29 @@
+import streamlit as st
+
+from cryptowise.i18n import get_localized_text
+from cryptowise.users import get_user_repository
+
+
+class SettingsManager:
+    def display_settings(self, get_localized_text, language):
+        st.subheader(get_localized_text(language, "settings_title"))
+        language_options = {
+            "en": get_localized_text(language, "language_en"),
+            "ur": get_localized_text(language, "language_ur"),
+            "ru": get_localized_text(language, "language_ru"),
+        }
+        selected_language = st.selectbox(
+            get_localized_text(language, "language_setting"),
+            options=list(language_options.keys()),
+            index=list(language_options.keys()).index(language),
+            format_func=lambda x: language_options[x],
+        )
+        if selected_language != language and st.session_state['logged_in_user']:
+            user = get_user_repository().get(st.session_state['logged_in_user'])
+            if user:
+                user.set_language(selected_language)
+        st.session_state['language'] = selected_language
+
+
+def settings():
+    SettingsManager().display_settings(get_localized_text, st.session_state['language'])
@@ -0,0 +1,160 @@
+import uuid
+
+import pandas as pd
+import streamlit as st
+
+from cryptowise.gateway import RateLimitExceeded, get_trade_gateway
+from cryptowise.i18n import get_translator
+from cryptowise.market import get_market, get_market_hub
+from cryptowise.orders import get_matching_engine
+from cryptowise.ledger import get_ledger
+from cryptowise.portfolio import get_portfolio
+from cryptowise.quotes import LANGUAGE_CURRENCIES, get_quotes
+
+
+def price_subscription(coin):
+    """
+    Returns this session's subscription to `coin`, replacing the previous one
+    when the selected coin changes.
+    """
+    hub = get_market_hub()
+    subscription = st.session_state.get('price_subscription')
+    if subscription is None or subscription.coin != coin:
+        if subscription is not None:
+            hub.unsubscribe(subscription)
+        subscription = hub.subscribe(coin)
+        st.session_state['price_subscription'] = subscription
+    return subscription
+
+
+@st.fragment(run_every=get_market().tick_interval)
+def price_panel(label):
+    # Reruns on its own every tick; only this panel is redrawn, not the page
+    subscription = st.session_state['price_subscription']
+    st.info(f"{label} {subscription.coin} : ${round(subscription.price, 4)}")
+
+
+def trading():
+    text = get_translator(st.session_state['language'])
+    market = get_market()
+    market.advance()
+    st.subheader(text("trading_title"))
+
+    if not st.session_state['logged_in_user']:
+        st.warning("Please login first to access trading.")
+        return
+
+    coin = st.selectbox(text("select_coin_label"), market.symbols)
+    price_subscription(coin)
+    price_panel(text('current_price_label'))
+    # Orders are sized from the market itself; the subscription may be a tick behind
+    price = round(market.get_price(coin), 4)
+
+    st.caption(text("previous_prices"))
+    col_day, col_year = st.columns(2)
+    col_day.metric(text("1_day_ago"), f"${market.get_close(coin, '1d', 1):,.4f}")
+    col_year.metric(text("1_year_ago"), f"${market.get_close(coin, '1d', 365):,.4f}")
+    st.line_chart(market.get_candles(coin, "1d")["close"])
+
+    engine = get_matching_engine()
+    user = st.session_state['logged_in_user']
+    book = engine.books[coin]
+    col_side, col_type = st.columns(2)
+    side = col_side.radio("Side", ["buy", "sell"], format_func=str.capitalize, horizontal=True)
+    order_type = col_type.radio("Order type", ["Market", "Limit"], horizontal=True)
+    limit_price = None
+    if order_type == "Limit":
+        # A stable key keeps the user's price across ticks; it starts at the market price
+        limit_key = f"limit_{coin}"
+        if limit_key not in st.session_state:
+            st.session_state[limit_key] = price
+        limit_price = st.number_input("Limit price (USD)", min_value=0.0001, format="%.4f", key=limit_key)
+
+    quotes = get_quotes()
+    col_amount, col_currency = st.columns([3, 1])
+    currency = col_currency.selectbox(
+        "Currency", quotes.currencies,
+        index=quotes.currencies.index(LANGUAGE_CURRENCIES.get(st.session_state['language'], "USD")),
+    )
+    amount = col_amount.number_input(text("amount_label") if currency == "USD" else f"Amount in {currency}",
+                                     min_value=round(quotes.convert(10.0, "USD", currency), 2))
+    if currency != "USD":
+        st.caption(f"1 {coin} = {quotes.quote(coin, currency):,.2f} {currency}; "
+                   f"{amount:,.2f} {currency} = ${quotes.convert(amount, currency, 'USD'):,.2f}")
+    amount = round(quotes.convert(amount, currency, "USD"), 2)
+
+    # The idempotency key changes only after a rerun that placed nothing new, so
+    # the second rerun of a double click replays the first order instead of repeating it
+    gateway = get_trade_gateway()
+    nonce = st.session_state.setdefault('order_nonce', uuid.uuid4().hex)
+    placed = False
+
+    if st.button(text("buy_now_button") if side == "buy" else "Sell"):
+        if amount > 0:
+            quantity = amount / (limit_price or price)
+            try:
+                order, trades, replay = gateway.submit(user, coin, side, quantity, limit_price,
+                                                       key=f"{nonce}:{coin}:{side}:{amount}:{limit_price}")
+            except RateLimitExceeded as e:
+                st.error(f"Too many orders: {e}")
+            else:
+                placed = not replay
+                filled = order["quantity"] - order["remaining"]
+                if replay:
+                    st.info(f"Order #{order['id']} was already placed; click again to place another.")
+                elif side == "buy" and order_type == "Market":
+                    st.success(f"You bought ${order['value']:,.2f} worth of {coin} "
+                               f"at ${round(order['value'] / filled, 4)}!")
+                else:
+                    st.success(f"Order #{order['id']}: {side} {quantity:.6f} {coin}, filled ${order['value']:,.2f}")
+                if not replay:
+                    market.record_volume(coin, filled)
+        else:
+            st.error(text("error_amount_less_than_0"))
+
+    with st.expander("Order book"):
+        col_bids, col_asks = st.columns(2)
+        col_bids.dataframe(pd.DataFrame(book.depth("buy"), columns=["bid", "quantity"]), hide_index=True)
+        col_asks.dataframe(pd.DataFrame(book.depth("sell"), columns=["ask", "quantity"]), hide_index=True)
+        for order in engine.open_orders(user, coin):
+            col_order, col_cancel = st.columns([3, 1])
+            col_order.write(f"#{order['id']} {order['side']} {order['remaining']:.6f} @ ${order['price']:,.4f}")
+            if col_cancel.button("Cancel", key=f"cancel_{order['id']}"):
+                engine.cancel(coin, order["id"])
+                st.rerun()
+
+    with st.expander("Swap"):
+        target = st.selectbox("Receive", [c for c in market.symbols if c != coin])
+        swap_quantity = st.number_input(f"{coin} to swap", min_value=0.0, format="%.6f")
+        rate = quotes.quote(coin, target)
+        st.caption(f"1 {coin} = {rate:,.6f} {target}; you receive about {swap_quantity * rate:,.6f} {target}")
+        if st.button("Swap", key="swap") and swap_quantity > 0:
+            try:
+                sold, bought, _, replay = gateway.swap(user, coin, target, swap_quantity,
+                                                       key=f"{nonce}:swap:{coin}:{target}:{swap_quantity}")
+            except RateLimitExceeded as e:
+                st.error(f"Too many orders: {e}")
+            else:
+                placed = not replay
+                if not replay:
+                    market.record_volume(coin, sold["quantity"])
+                    market.record_volume(target, bought["quantity"])
+                st.success(f"Swapped {sold['quantity']:.6f} {coin} for {bought['quantity']:.6f} {target}")
+
+    if not placed:
+        st.session_state['order_nonce'] = uuid.uuid4().hex
+
+    portfolio = get_portfolio()
+    portfolio.refresh(get_ledger())
+    positions = portfolio.valuation(st.session_state['logged_in_user'])
+    if len(positions):
+        st.subheader("💼 Portfolio")
+        held = positions[positions["quantity"] != 0]
+        unrealized = held["unrealized"].sum()
+        basis = (held["value"] - held["unrealized"]).abs().sum()
+        col_unrealized, col_realized = st.columns(2)
+        col_unrealized.metric("Unrealized P&L", f"${unrealized:,.2f}",
+                              delta=f"{unrealized / basis:.2%}" if basis > 0 else None)
+        col_realized.metric("Realized P&L", f"${positions['realized'].sum():,.2f}")
+        if len(held):
+            st.dataframe(held.droplevel("user"), use_container_width=True)
@@ -0,0 +1,127 @@
+"""
+Portfolio positions and P&L.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from cryptowise.instrumentation import get_instrumentation
+from cryptowise.market import get_market
+
+
+def _average_cost(group, quantity, price, held, cost):
+    """
+    Folds trades into positions at average cost. `group` numbers the position
+    of each trade and is sorted, with a position's trades in time order;
+    `held` and `cost` are the quantity and cost basis of every position
+    before them. Returns each position's quantity, cost basis and the P&L
+    realized by the trades.
+
+    Adding to a position adds to its cost; reducing it realizes the gap to
+    the average cost and scales the cost with the quantity kept. From one
+    opening to the next, the cost is therefore the running sum of additions
+    scaled by the running product of kept fractions, and both are grouped
+    running sums (the product in log space). A trade through zero closes
+    the position and opens the remainder at its price.
+    """
+    first = np.r_[True, group[1:] != group[:-1]]
+    last = np.r_[group[1:] != group[:-1], True]
+    after = pd.Series(quantity).groupby(group).cumsum().to_numpy() + held[group]
+    # A round trip leaves rounding residue, not a position
+    after[np.abs(after) <= 1e-9 * np.abs(quantity)] = 0.0
+    before = np.where(first, held[group], np.r_[0.0, after[:-1]])
+
+    side = np.sign(before)
+    opens = side == 0
+    closes = ~opens & (np.sign(after) != side)
+    adds = ~opens & (np.sign(quantity) == side)
+    reduces = ~opens & ~adds & ~closes
+    fresh = opens | (closes & (after != 0))
+    starts = first | fresh
+
+    added = np.where(fresh, after * price, np.where(adds, quantity * price, 0.0))
+    kept = np.zeros(len(group))
+    kept[reduces] = np.log(after[reduces] / before[reduces])
+    segment = np.cumsum(starts)
+    scale = pd.Series(kept).groupby(segment).cumsum().to_numpy()
+    # The cost carried into a position's first trade is there before any of its scaling
+    carried = np.where(first & ~fresh, cost[group], 0.0)
+    basis = np.exp(scale) * pd.Series(added * np.exp(-scale) + carried).groupby(segment).cumsum().to_numpy()
+    basis[closes & (after == 0)] = 0.0
+
+    basis_before = np.where(first, cost[group], np.r_[0.0, basis[:-1]])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        average = basis_before / before
+    realized = np.where(reduces, -quantity * (price - average), 0.0)
+    realized = np.where(closes, before * (price - average), realized)
+    return after[last], basis[last], np.bincount(group, realized, minlength=len(held))
+
+
+class Portfolio:
+    """
+    Holdings, average cost basis and realized P&L per user and coin, folded
+    in from the ledger with grouped operations and revalued against the
+    market in one pass.
+    """
+    def __init__(self, market):
+        self.market = market
+        self.positions = pd.DataFrame(columns=["quantity", "cost", "realized", "coin_index"],
+                                      index=pd.MultiIndex.from_tuples([], names=["user", "coin"]))
+        self._seen = 0
+        self._lock = threading.Lock()
+
+    def refresh(self, ledger):
+        """
+        Folds in the trades recorded since the last refresh.
+        """
+        with self._lock, get_instrumentation().span("portfolio.refresh"):
+            records = ledger.records(start=self._seen)
+            if not len(records):
+                return
+            trades = pd.DataFrame({
+                "user": pd.Series(records["user"]).str.decode("utf-8"),
+                "coin": pd.Series(records["coin"]).str.decode("utf-8"),
+            })
+            grouped = trades.groupby(["user", "coin"])
+            group = grouped.ngroup().to_numpy()
+            # A stable sort keeps each position's trades in ledger order
+            order = np.argsort(group, kind="stable")
+            keys = grouped.size().index
+            before = self.positions.reindex(keys)[["quantity", "cost", "realized"]].fillna(0.0)
+            quantity, cost, realized = _average_cost(
+                group[order], (records["amount"] / records["price"])[order], records["price"][order],
+                before["quantity"].to_numpy(dtype=float), before["cost"].to_numpy(dtype=float),
+            )
+            new = pd.DataFrame({"quantity": quantity, "cost": cost,
+                                "realized": before["realized"].to_numpy(dtype=float) + realized}, index=keys)
+            positions = new.combine_first(self.positions[["quantity", "cost", "realized"]])
+            positions["coin_index"] = positions.index.get_level_values("coin").map(self.market._index)
+            self.positions = positions
+            self._seen += len(records)
+
+    def valuation(self, user=None):
+        """
+        Returns positions with market value, unrealized P&L at the latest
+        prices and realized P&L. Closed positions have a zero quantity and no
+        average cost.
+        """
+        positions = self.positions
+        if user is not None:
+            positions = positions[positions.index.get_level_values("user") == user]
+        prices = self.market.latest()[positions["coin_index"].to_numpy(dtype=int)]
+        quantity = positions["quantity"].to_numpy(dtype=float)
+        cost = positions["cost"].to_numpy(dtype=float)
+        return pd.DataFrame({
+            "quantity": quantity,
+            "avg_cost": np.divide(cost, quantity, out=np.full_like(cost, np.nan), where=quantity != 0),
+            "price": prices,
+            "value": quantity * prices,
+            "unrealized": quantity * prices - cost,
+            "realized": positions["realized"].to_numpy(dtype=float),
+        }, index=positions.index)
+
+@st.cache_resource
+def get_portfolio():
+    return Portfolio(get_market())
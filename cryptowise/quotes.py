@@ -0,0 +1,66 @@
+"""
+Cross-rate quotes between coins and fiat currencies.
+"""
+import threading
+
+import numpy as np
+import streamlit as st
+
+from cryptowise.market import get_market
+
+# Units of each currency per US dollar
+FIAT_RATES = {
+    "USD": 1.0,
+    "EUR": 0.92,
+    "GBP": 0.79,
+    "PKR": 278.0,
+    "INR": 83.5,
+    "RUB": 92.0,
+}
+LANGUAGE_CURRENCIES = {"en": "USD", "ur": "PKR", "ru": "PKR"}
+
+
+class QuoteMatrix:
+    """
+    Dense cross-rate matrix over every coin and fiat currency:
+    `rates[i, j]` is the price of one unit of asset i in units of asset j.
+    The USD value of every asset is kept in one vector and the matrix is
+    rebuilt from it with a single outer division whenever prices change,
+    so a quote is one array lookup. Readers always see a complete matrix;
+    a new one is built aside and swapped in.
+    """
+    def __init__(self, market, fiat_rates=FIAT_RATES):
+        self.market = market
+        self.coins = list(market.symbols)
+        self.currencies = list(fiat_rates)
+        self.assets = self.coins + self.currencies
+        self._index = {asset: i for i, asset in enumerate(self.assets)}
+        self._usd = np.empty(len(self.assets))
+        self._usd[len(self.coins):] = 1 / np.asarray(list(fiat_rates.values()), dtype=float)
+        self._lock = threading.Lock()
+        self.version = 0
+        self.rates = None
+        self._update(market.add_tick_listener(self.update)[-1])
+
+    def update(self, times, prices):
+        self._update(prices[-1])
+
+    def _update(self, coin_prices):
+        with self._lock:
+            self._usd[:len(self.coins)] = coin_prices
+            self.rates = np.divide.outer(self._usd, self._usd)
+            self.version += 1
+
+    def quote(self, base, quote):
+        """
+        Returns the price of one unit of `base` in units of `quote`.
+        """
+        return float(self.rates[self._index[base], self._index[quote]])
+
+    def convert(self, amount, base, quote):
+        return amount * self.quote(base, quote)
+
+
+@st.cache_resource
+def get_quotes():
+    return QuoteMatrix(get_market())
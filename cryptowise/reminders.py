@@ -0,0 +1,204 @@
+"""
+Reminder scheduling and delivery.
+"""
+import bisect
+import heapq
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+import streamlit as st
+
+from cryptowise.market import get_market
+
+
+class Reminder:
+    """
+    A time reminder (`due`, epoch seconds) or a price alert (`coin`, `threshold`),
+    as read out of a ReminderTable.
+    """
+    __slots__ = ("id", "user", "message", "due", "coin", "threshold")
+
+    def __init__(self, id, user, message, due=None, coin=None, threshold=None):
+        self.id = id
+        self.user = user
+        self.message = message
+        self.due = due
+        self.coin = coin
+        self.threshold = threshold
+
+    @property
+    def time(self):
+        return datetime.fromtimestamp(self.due).strftime('%Y-%m-%d %H:%M:%S')
+
+
+class ReminderTable:
+    """
+    Reminders kept as typed columns indexed by reminder id: int32 user codes,
+    int64 due times (-1 for price alerts), int16 coin codes (-1 for time
+    reminders) and float64 thresholds, with the messages in a list. Rows are
+    turned into Reminder objects only when a session reads them, and the ids
+    of released rows are reused.
+    """
+    def __init__(self, coins, capacity=1024):
+        self.coins = list(coins)
+        self._coin_codes = {coin: i for i, coin in enumerate(self.coins)}
+        self.users = []
+        self._user_codes = {}
+        self._messages = []
+        self._free = []
+        self._user = np.empty(capacity, dtype=np.int32)
+        self._due = np.empty(capacity, dtype=np.int64)
+        self._coin = np.empty(capacity, dtype=np.int16)
+        self._threshold = np.empty(capacity, dtype=np.float64)
+
+    def __len__(self):
+        return len(self._messages) - len(self._free)
+
+    def _grow(self):
+        capacity = 2 * len(self._due)
+        for name in ("_user", "_due", "_coin", "_threshold"):
+            column = getattr(self, name)
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:len(column)] = column
+            setattr(self, name, grown)
+
+    def add(self, user, message, due=-1, coin=None, threshold=np.nan):
+        """
+        Stores a reminder and returns its id.
+        """
+        if self._free:
+            id = self._free.pop()
+            self._messages[id] = message
+        else:
+            id = len(self._messages)
+            if id == len(self._due):
+                self._grow()
+            self._messages.append(message)
+        self._user[id] = self._user_codes.setdefault(user, len(self._user_codes))
+        if len(self.users) < len(self._user_codes):
+            self.users.append(user)
+        self._due[id] = due
+        self._coin[id] = -1 if coin is None else self._coin_codes[coin]
+        self._threshold[id] = threshold
+        return id
+
+    def get(self, id):
+        coin = int(self._coin[id])
+        if coin < 0:
+            return Reminder(id, self.users[self._user[id]], self._messages[id], due=int(self._due[id]))
+        return Reminder(id, self.users[self._user[id]], self._messages[id],
+                        coin=self.coins[coin], threshold=float(self._threshold[id]))
+
+    def user(self, id):
+        return self.users[self._user[id]]
+
+    def release(self, id):
+        """
+        Frees a row for reuse.
+        """
+        self._messages[id] = None
+        self._free.append(id)
+
+    def nbytes(self):
+        """
+        Returns the bytes held by the typed columns.
+        """
+        return sum(getattr(self, name).nbytes for name in ("_user", "_due", "_coin", "_threshold"))
+
+
+class ReminderScheduler:
+    """
+    Process-wide reminder scheduler. Reminders are rows of a ReminderTable;
+    time reminders sit in a min-heap of (due, id) and price alerts in sorted
+    per-coin threshold lists of ids, so each check only touches the
+    reminders that are due. A dispatcher thread delivers fired reminders to
+    per-user inboxes that sessions drain on rerun.
+    """
+    def __init__(self, market, poll_interval=1.0):
+        self.market = market
+        self.poll_interval = poll_interval
+        self._table = ReminderTable(market.symbols)
+        self._heap = []
+        self._thresholds = {coin: [] for coin in market.symbols}
+        self._alerts = {coin: [] for coin in market.symbols}
+        self._pending = {}
+        self._inbox = {}
+        self._last_prices = market.latest()
+        self._wakeup = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="reminder-dispatcher", daemon=True)
+        self._thread.start()
+
+    def add_time_reminder(self, user, message, due):
+        due = int(due.timestamp())
+        with self._wakeup:
+            id = self._table.add(user, message, due=due)
+            heapq.heappush(self._heap, (due, id))
+            self._pending.setdefault(user, {})[id] = None
+            self._wakeup.notify()
+            return self._table.get(id)
+
+    def add_price_alert(self, user, message, coin, threshold):
+        with self._wakeup:
+            id = self._table.add(user, message, coin=coin, threshold=threshold)
+            thresholds = self._thresholds[coin]
+            i = bisect.bisect_right(thresholds, threshold)
+            thresholds.insert(i, threshold)
+            self._alerts[coin].insert(i, id)
+            self._pending.setdefault(user, {})[id] = None
+            return self._table.get(id)
+
+    def pending(self, user):
+        with self._wakeup:
+            return [self._table.get(id) for id in self._pending.get(user, {})]
+
+    def drain(self, user):
+        """
+        Returns and clears the reminders delivered to a user.
+        """
+        with self._wakeup:
+            reminders = [self._table.get(id) for id in self._inbox.pop(user, [])]
+            for reminder in reminders:
+                self._table.release(reminder.id)
+            return reminders
+
+    def _deliver(self, id):
+        user = self._table.user(id)
+        del self._pending[user][id]
+        self._inbox.setdefault(user, []).append(id)
+
+    def check_time(self, now):
+        while self._heap and self._heap[0][0] <= now:
+            self._deliver(heapq.heappop(self._heap)[1])
+
+    def check_prices(self, prices):
+        # Alerts whose threshold lies between the previous and the new price were crossed
+        low, high = np.minimum(self._last_prices, prices), np.maximum(self._last_prices, prices)
+        for i in np.flatnonzero(prices != self._last_prices):
+            coin = self.market.symbols[i]
+            thresholds = self._thresholds[coin]
+            start = bisect.bisect_left(thresholds, low[i])
+            end = bisect.bisect_right(thresholds, high[i])
+            if start < end:
+                for id in self._alerts[coin][start:end]:
+                    self._deliver(id)
+                del thresholds[start:end]
+                del self._alerts[coin][start:end]
+        self._last_prices = prices
+
+    def _run(self):
+        while True:
+            self.market.advance()
+            prices = self.market.latest()
+            with self._wakeup:
+                self.check_time(time.time())
+                self.check_prices(prices)
+                timeout = self.poll_interval
+                if self._heap:
+                    timeout = min(timeout, max(self._heap[0][0] - time.time(), 0))
+                self._wakeup.wait(timeout)
+
+@st.cache_resource
+def get_scheduler():
+    return ReminderScheduler(get_market())
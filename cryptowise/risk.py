@@ -0,0 +1,173 @@
+"""
+Rolling risk analytics over market ticks and user positions.
+"""
+import threading
+from statistics import NormalDist
+
+import numpy as np
+import streamlit as st
+
+from cryptowise.market import get_market
+
+
+class RollingWindow:
+    """
+    Sliding-window mean and variance of every column, updated Welford style:
+    pushing a row replaces the oldest one in O(1) per column. The sums are
+    recomputed from the window once per full turn to stop rounding drift.
+    """
+    def __init__(self, size, n_columns):
+        self.size = size
+        self.values = np.zeros((size, n_columns))
+        self.mean = np.zeros(n_columns)
+        self.m2 = np.zeros(n_columns)
+        self.count = 0
+        self._head = 0
+
+    def push(self, row):
+        if self.count < self.size:
+            self.count += 1
+            delta = row - self.mean
+            self.mean += delta / self.count
+            self.m2 += delta * (row - self.mean)
+        else:
+            old = self.values[self._head]
+            mean = self.mean + (row - old) / self.size
+            self.m2 += (row - old) * (row - mean + old - self.mean)
+            self.mean = mean
+        self.values[self._head] = row
+        self._head = (self._head + 1) % self.size
+        if self._head == 0:
+            window = self.window()
+            self.mean = window.mean(axis=0)
+            self.m2 = ((window - self.mean) ** 2).sum(axis=0)
+
+    def variance(self):
+        if self.count < 2:
+            return np.full_like(self.mean, np.nan)
+        return np.maximum(self.m2, 0) / (self.count - 1)
+
+    def window(self, columns=slice(None)):
+        """
+        Returns the rows in the window, oldest first.
+        """
+        if self.count < self.size:
+            return self.values[:self.count, columns]
+        return np.roll(self.values[:, columns], -self._head, axis=0)
+
+
+class RiskEngine:
+    """
+    Risk statistics for every coin, fed by the market's tick listener. Each
+    tick pushes one row of log returns into a RollingWindow and updates the
+    running peak and maximum drawdown, so its cost is one vectorized O(1)
+    step per coin regardless of the window length. Value at risk and
+    correlations are derived from the window when asked for and cached per
+    coin and per user until the next tick.
+    """
+    def __init__(self, market, window=600, confidence=0.95, horizon=86400):
+        self.market = market
+        self.confidence = confidence
+        self.horizon = horizon
+        self._z = NormalDist().inv_cdf(confidence)
+        # Tick returns are scaled to the horizon with the square-root-of-time rule
+        self._horizon_scale = np.sqrt(horizon / market.tick_interval)
+        self._annual_scale = np.sqrt(market.SECONDS_PER_YEAR / market.tick_interval)
+        self._returns = RollingWindow(window, len(market.symbols))
+        self._lock = threading.Lock()
+        self._coin_cache = {}
+        self._user_cache = {}
+        self.version = 0
+        history = market.add_tick_listener(self.update)
+        with self._lock:
+            self._last = history[0]
+            self._peak = history[0].copy()
+            self._max_drawdown = np.zeros(len(market.symbols))
+            self._update(history[1:])
+
+    @property
+    def samples(self):
+        return self._returns.count
+
+    def update(self, times, prices):
+        with self._lock:
+            self._update(prices)
+
+    def _update(self, prices):
+        for row in prices:
+            self._returns.push(np.log(row / self._last))
+            np.maximum(self._peak, row, out=self._peak)
+            np.maximum(self._max_drawdown, 1 - row / self._peak, out=self._max_drawdown)
+            self._last = row
+        self.version += len(prices)
+
+    def coin_risk(self, coin):
+        """
+        Returns annualized volatility, parametric and historical VaR over the
+        horizon (as fractions of the position) and the maximum drawdown.
+        """
+        i = self.market._index[coin]
+        with self._lock:
+            cached = self._coin_cache.get(coin)
+            if cached is not None and cached[0] == self.version:
+                return cached[1]
+            std = float(np.sqrt(self._returns.variance()[i]))
+            window = self._returns.window(i)
+            historical = -np.quantile(window, 1 - self.confidence) if len(window) else np.nan
+            stats = {
+                "volatility": std * float(self._annual_scale),
+                "var_parametric": float((self._z * std - self._returns.mean[i]) * self._horizon_scale),
+                "var_historical": float(historical * self._horizon_scale),
+                "max_drawdown": float(self._max_drawdown[i]),
+            }
+            self._coin_cache[coin] = (self.version, stats)
+            return stats
+
+    def correlation(self, coins=None):
+        """
+        Returns the correlation matrix of tick returns over the window.
+        """
+        columns = [self.market._index[c] for c in (coins or self.market.symbols)]
+        with self._lock:
+            window = self._returns.window(columns)
+        if len(window) < 2:
+            return np.full((len(columns), len(columns)), np.nan)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.corrcoef(window, rowvar=False).reshape(len(columns), len(columns))
+
+    def portfolio_risk(self, user, coins, values):
+        """
+        Returns the parametric and historical VaR in USD over the horizon of
+        holdings worth `values` in `coins`, and their correlation matrix.
+        """
+        key = (tuple(coins), tuple(np.round(values, 2)))
+        with self._lock:
+            cached = self._user_cache.get(user)
+            if cached is not None and cached[:2] == (self.version, key):
+                return cached[2]
+            columns = [self.market._index[c] for c in coins]
+            window = self._returns.window(columns)
+        values = np.asarray(values, dtype=float)
+        if len(window) < 2:
+            result = {"var_parametric": np.nan, "var_historical": np.nan,
+                      "correlation": np.full((len(coins), len(coins)), np.nan)}
+        else:
+            covariance = np.atleast_2d(np.cov(window, rowvar=False))
+            pnl = window @ values
+            std = np.sqrt(max(float(values @ covariance @ values), 0.0))
+            with np.errstate(invalid="ignore", divide="ignore"):
+                scale = np.sqrt(np.diag(covariance))
+                correlation = covariance / np.outer(scale, scale)
+            result = {
+                "var_parametric": float((self._z * std - pnl.mean()) * self._horizon_scale),
+                "var_historical": float(-np.quantile(pnl, 1 - self.confidence) * self._horizon_scale),
+                "correlation": correlation,
+            }
+        with self._lock:
+            self._user_cache[user] = (self.version, key, result)
+        return result
+
+
+@st.cache_resource
+def get_risk_engine():
+    return RiskEngine(get_market())
@@ -0,0 +1,181 @@
+"""
+Full-text search over the educational content.
+
+The inverted index of every language is built from the content files and
+serialized to content/search_index.json together with a hash of its
+sources, so startup only loads it. It is rebuilt when the sources change,
+or explicitly with:
+
+    python -m cryptowise.search
+"""
+import bisect
+import collections
+import hashlib
+import json
+import math
+import os
+import re
+import unicodedata
+
+import streamlit as st
+
+from cryptowise.content import CONTENT_DIR, SECTIONS, read_content
+from cryptowise.i18n import LANGUAGES, LOCALES_DIR
+
+SEARCH_INDEX_PATH = os.path.join(CONTENT_DIR, "search_index.json")
+INDEX_FORMAT = 1
+MAX_PREFIX_TERMS = 64
+
+_TOKEN = re.compile(r"\w+")
+# Arabic code points that Urdu text often contains in place of the Urdu letters
+_URDU_LETTERS = str.maketrans({"ي": "ی", "ى": "ی", "ك": "ک", "ه": "ہ"})
+
+
+def normalize(text):
+    """
+    Folds case, compatibility forms and diacritics (including Urdu harakat),
+    drops zero-width joiners and maps Arabic letter variants to Urdu ones.
+    """
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text if unicodedata.category(c) not in ("Mn", "Cf"))
+    return unicodedata.normalize("NFC", text).casefold().translate(_URDU_LETTERS)
+
+
+def tokenize(text):
+    return _TOKEN.findall(normalize(text))
+
+
+def documents(language):
+    """
+    Splits the content of a language into searchable documents: one per
+    bullet of the Benefits, Risks and Solutions pages and one per heading
+    of every coin on the Crypto details page.
+    """
+    content = read_content(language)
+    with open(os.path.join(LOCALES_DIR, f"{language}.json"), encoding="utf-8") as f:
+        titles = json.load(f)
+    docs = []
+    for section, page in SECTIONS.items():
+        for item in content[section]:
+            docs.append({"page": page, "title": titles.get(f"{section}_title", page), "text": item})
+    for coin, details in content["coins"].items():
+        for heading, value in details.items():
+            text = " ".join(value) if isinstance(value, list) else value
+            docs.append({"page": "Crypto details", "title": f"{coin} · {heading}", "text": text})
+    return docs
+
+
+class SearchIndex:
+    """
+    Inverted index of one language. Terms are kept sorted so a prefix maps
+    to a contiguous range found by bisection; each term's postings are a
+    flat [doc, term frequency, ...] list. Results are ranked with BM25,
+    with terms reached only through a prefix counting for half.
+    """
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self, docs, terms, postings, lengths):
+        self.docs = docs
+        self.terms = terms
+        self.postings = postings
+        self.lengths = lengths
+        self._positions = {term: i for i, term in enumerate(terms)}
+        self._avg_length = sum(lengths) / len(lengths) if lengths else 0.0
+
+    @classmethod
+    def build(cls, docs):
+        counts = [collections.Counter(tokenize(f"{doc['title']} {doc['text']}")) for doc in docs]
+        inverted = collections.defaultdict(list)
+        for i, count in enumerate(counts):
+            for term, tf in count.items():
+                inverted[term].extend((i, tf))
+        terms = sorted(inverted)
+        return cls(docs, terms, [inverted[t] for t in terms], [sum(c.values()) for c in counts])
+
+    def to_dict(self):
+        return {"docs": self.docs, "terms": self.terms, "postings": self.postings, "lengths": self.lengths}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["docs"], data["terms"], data["postings"], data["lengths"])
+
+    def _expand(self, token):
+        exact = self._positions.get(token)
+        start = bisect.bisect_left(self.terms, token)
+        end = bisect.bisect_left(self.terms, token + "\U0010ffff", start)
+        matches = [(exact, 1.0)] if exact is not None else []
+        matches += [(i, 0.5) for i in range(start, min(end, start + MAX_PREFIX_TERMS)) if i != exact]
+        return matches
+
+    def search(self, query, limit=10):
+        """
+        Returns up to `limit` (score, doc) pairs, best first. Every query
+        word also matches the terms it is a prefix of.
+        """
+        scores = collections.defaultdict(float)
+        n = len(self.docs)
+        for token in set(tokenize(query)):
+            for position, weight in self._expand(token):
+                postings = self.postings[position]
+                idf = math.log(1 + (n - len(postings) / 2 + 0.5) / (len(postings) / 2 + 0.5))
+                for j in range(0, len(postings), 2):
+                    doc, tf = postings[j], postings[j + 1]
+                    norm = self.K1 * (1 - self.B + self.B * self.lengths[doc] / self._avg_length)
+                    scores[doc] += weight * idf * tf * (self.K1 + 1) / (tf + norm)
+        best = sorted(scores.items(), key=lambda item: -item[1])[:limit]
+        return [(score, self.docs[doc]) for doc, score in best]
+
+
+def source_hash():
+    digest = hashlib.sha256(str(INDEX_FORMAT).encode())
+    for directory in (CONTENT_DIR, LOCALES_DIR):
+        for language in LANGUAGES:
+            with open(os.path.join(directory, f"{language}.json"), "rb") as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+def build_indexes():
+    return {language: SearchIndex.build(documents(language)) for language in LANGUAGES}
+
+
+def save_indexes(indexes, path=SEARCH_INDEX_PATH):
+    data = {"source_hash": source_hash(), "languages": {lang: index.to_dict() for lang, index in indexes.items()}}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+
+
+def read_indexes(path=SEARCH_INDEX_PATH):
+    """
+    Loads the serialized indexes, or rebuilds them (and tries to save them)
+    when the file is missing or older than its sources.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("source_hash") == source_hash():
+            return {lang: SearchIndex.from_dict(index) for lang, index in data["languages"].items()}
+    except (OSError, ValueError):
+        pass
+    indexes = build_indexes()
+    try:
+        save_indexes(indexes, path)
+    except OSError:
+        pass
+    return indexes
+
+
+@st.cache_resource
+def get_search_indexes():
+    return read_indexes()
+
+
+def search(query, language, limit=10):
+    indexes = get_search_indexes()
+    return indexes.get(language, indexes["en"]).search(query, limit)
+
+
+if __name__ == "__main__":
+    save_indexes(build_indexes())
+    print(f"search index written to {SEARCH_INDEX_PATH}")
@@ -0,0 +1,171 @@
+"""
+User accounts: the User model, password hashing and the shared SQLite user store.
+"""
+import contextlib
+import hashlib
+import hmac
+import os
+import queue
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+
+class User:
+    __slots__ = ("user_id", "username", "email", "_hashed_password", "language")
+
+    def __init__(self, user_id, username, email, hashed_password, language="en"):
+        self.user_id = user_id
+        self.username = username
+        self.email = email
+        self._hashed_password = hashed_password
+        self.language = language  # User language preference
+
+    def check_password(self, password):
+        """
+        Check if the provided password matches the stored hashed password.
+        Outdated hashes are upgraded in place after a successful check.
+        """
+        hasher = get_password_hasher()
+        if not hasher.verify(password, self._hashed_password):
+            return False
+        if hasher.needs_upgrade(self._hashed_password):
+            self._hashed_password = hasher.hash(password)
+            get_user_repository().save(self)
+        return True
+
+    def set_language(self, language):
+        self.language = language
+        get_user_repository().save(self)
+
+USERS_DB_PATH = "users.db"
+
+class UserRepository:
+    """
+    Users shared by every session, stored in SQLite behind a small
+    connection pool. Lookups go through the unique username index and
+    a process-wide cache of User objects.
+    """
+    def __init__(self, path, pool_size=4):
+        self.path = path
+        self._pool = queue.Queue()
+        for _ in range(pool_size):
+            self._pool.put(sqlite3.connect(path, check_same_thread=False))
+        self._cache = {}
+        self._cache_lock = threading.Lock()
+        with self._connection() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS users ("
+                "user_id TEXT PRIMARY KEY, username TEXT NOT NULL, email TEXT NOT NULL, "
+                "hashed_password TEXT NOT NULL, language TEXT NOT NULL)"
+            )
+            conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS users_username ON users (username)")
+
+    @contextlib.contextmanager
+    def _connection(self):
+        conn = self._pool.get()
+        try:
+            with conn:
+                yield conn
+        finally:
+            self._pool.put(conn)
+
+    def exists(self, username):
+        if username in self._cache:
+            return True
+        with self._connection() as conn:
+            return conn.execute("SELECT 1 FROM users WHERE username = ?", (username,)).fetchone() is not None
+
+    def get(self, username):
+        user = self._cache.get(username)
+        if user is not None:
+            return user
+        with self._connection() as conn:
+            row = conn.execute(
+                "SELECT user_id, username, email, hashed_password, language FROM users WHERE username = ?",
+                (username,),
+            ).fetchone()
+        if row is None:
+            return None
+        user = User(*row)
+        with self._cache_lock:
+            return self._cache.setdefault(username, user)
+
+    def add(self, user):
+        """
+        Inserts a new user. Returns False if the username is taken.
+        """
+        try:
+            with self._connection() as conn:
+                conn.execute(
+                    "INSERT INTO users (user_id, username, email, hashed_password, language) VALUES (?, ?, ?, ?, ?)",
+                    (user.user_id, user.username, user.email, user._hashed_password, user.language),
+                )
+        except sqlite3.IntegrityError:
+            return False
+        return True
+
+    def save(self, user):
+        with self._connection() as conn:
+            conn.execute(
+                "UPDATE users SET email = ?, hashed_password = ?, language = ? WHERE user_id = ?",
+                (user.email, user._hashed_password, user.language, user.user_id),
+            )
+        with self._cache_lock:
+            self._cache.pop(user.username, None)
+
+class PasswordHasher:
+    """
+    Salted PBKDF2-SHA256 password hashing, run on a bounded worker pool so a
+    burst of logins queues up instead of stalling every script thread.
+    Records look like "pbkdf2_sha256$<iterations>$<salt>$<hash>"; plain
+    SHA-256 hex digests from older accounts are still accepted.
+
+    hash() and verify() wait for their result, so the script thread of the
+    session that logs in is still blocked for the whole derivation plus any
+    wait for a free worker. The pool bounds how many derivations run at once;
+    PBKDF2 releases the GIL, so other sessions keep rerunning meanwhile.
+    """
+    ALGORITHM = "pbkdf2_sha256"
+
+    def __init__(self, iterations=200_000, workers=4):
+        self.iterations = iterations
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hasher")
+
+    @staticmethod
+    def _derive(password, salt, iterations):
+        return hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations)
+
+    def hash(self, password):
+        salt = os.urandom(16)
+        digest = self._pool.submit(self._derive, password, salt, self.iterations).result()
+        return f"{self.ALGORITHM}${self.iterations}${salt.hex()}${digest.hex()}"
+
+    def verify(self, password, record):
+        if not record.startswith(self.ALGORITHM + "$"):
+            legacy = self._pool.submit(lambda: hashlib.sha256(password.encode()).hexdigest()).result()
+            return hmac.compare_digest(legacy, record)
+        _, iterations, salt, expected = record.split("$")
+        digest = self._pool.submit(self._derive, password, bytes.fromhex(salt), int(iterations)).result()
+        return hmac.compare_digest(digest.hex(), expected)
+
+    def needs_upgrade(self, record):
+        return not record.startswith(f"{self.ALGORITHM}${self.iterations}$")
+
+
+@st.cache_resource
+def get_user_repository():
+    return UserRepository(USERS_DB_PATH)
+
+@st.cache_resource
+def get_password_hasher():
+    return PasswordHasher()
+
+def hash_password(password):
+    """
+    Hashes the password with a salted, iterated KDF on the hashing pool.
+    """
+    return get_password_hasher().hash(password)